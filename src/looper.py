@@ -11,8 +11,14 @@ import numpy as np
 from datetime import datetime
 import tempfile
 import shutil
+import errno
 import re
-import shutil
+import bisect
+import concurrent.futures
+import hashlib
+import queue
+import sqlite3
+import time
 from shutil import which
 
 def resource_path(relpath: str) -> str:
@@ -31,6 +37,972 @@ def resource_path(relpath: str) -> str:
         else:
             return os.path.join(project_root, relpath)
 
+# Upper bound on concurrent probes; probing is I/O bound (network shares), not CPU bound
+PROBE_MAX_WORKERS = min(8, (os.cpu_count() or 4) * 2)
+
+# Extensions picked up from dialogs, drops and folder scans
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv')
+
+# Probe engines: 'fast' reads the container index (or counts packets) with ffprobe,
+# 'exact' decodes every frame with ffprobe, 'opencv' is the legacy estimate
+PROBE_MODES = ('fast', 'exact', 'opencv')
+PROBE_ENGINE_RANK = {'opencv': 0, 'fast': 1, 'exact': 2}
+
+# Sources whose real and average frame rates differ by more than this are flagged VFR
+VFR_TOLERANCE = 0.01
+
+def parse_rational(value):
+    """Parse an ffprobe rate such as '30000/1001' into a float (0.0 if invalid)"""
+    try:
+        if '/' in value:
+            num, den = value.split('/', 1)
+            return float(num) / float(den) if float(den) else 0.0
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+# Content fingerprint: size + head + tail + a few evenly spaced middle samples
+FINGERPRINT_CHUNK_BYTES = 1024 * 1024
+FINGERPRINT_SAMPLE_BYTES = 64 * 1024
+FINGERPRINT_MIDDLE_SAMPLES = 4
+
+def compute_fingerprint(path):
+    """Cheap, stable content hash that never reads the whole file (unless it's tiny)"""
+    size = os.path.getsize(path)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(size.to_bytes(8, 'little'))
+    
+    with open(path, 'rb') as f:
+        if size <= 2 * FINGERPRINT_CHUNK_BYTES + FINGERPRINT_MIDDLE_SAMPLES * FINGERPRINT_SAMPLE_BYTES:
+            digest.update(f.read())
+            return digest.hexdigest()
+        
+        digest.update(f.read(FINGERPRINT_CHUNK_BYTES))
+        
+        middle_start = FINGERPRINT_CHUNK_BYTES
+        middle_span = size - 2 * FINGERPRINT_CHUNK_BYTES - FINGERPRINT_SAMPLE_BYTES
+        for i in range(1, FINGERPRINT_MIDDLE_SAMPLES + 1):
+            f.seek(middle_start + middle_span * i // (FINGERPRINT_MIDDLE_SAMPLES + 1))
+            digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+        
+        f.seek(size - FINGERPRINT_CHUNK_BYTES)
+        digest.update(f.read(FINGERPRINT_CHUNK_BYTES))
+    return digest.hexdigest()
+
+class VideoInfo:
+    """Probe results for one input, produced once and passed through the whole pipeline"""
+    
+    __slots__ = ('path', 'filename', 'fps', 'frame_count', 'width', 'height', 'duration',
+                 'file_size_mb', 'probe_engine', 'is_vfr', 'codec_name', 'pix_fmt', 'profile', 'level',
+                 'fingerprint')
+    
+    # Fields persisted by ProbeCache (path and filename are derived from the key)
+    CACHED_FIELDS = ('fps', 'frame_count', 'width', 'height', 'duration', 'file_size_mb',
+                     'probe_engine', 'is_vfr', 'codec_name', 'pix_fmt', 'profile', 'level', 'fingerprint')
+    
+    def __init__(self, path, fps, frame_count, width, height, duration, file_size_mb,
+                 probe_engine='opencv', is_vfr=False, codec_name=None, pix_fmt=None,
+                 profile=None, level=None, fingerprint=None):
+        self.path = path
+        self.filename = os.path.basename(path)
+        self.fps = fps
+        self.frame_count = frame_count
+        self.width = width
+        self.height = height
+        self.duration = duration
+        self.file_size_mb = file_size_mb
+        self.probe_engine = probe_engine
+        self.is_vfr = is_vfr
+        self.codec_name = codec_name
+        self.pix_fmt = pix_fmt
+        self.profile = profile  # codec profile/level as ffprobe names them (smart render matches them)
+        self.level = level
+        self.fingerprint = fingerprint  # compute_fingerprint() - stable key for dedupe and caches
+    
+    def to_dict(self):
+        """Cacheable fields as a plain dict"""
+        return {field: getattr(self, field) for field in self.CACHED_FIELDS}
+    
+    @classmethod
+    def from_dict(cls, path, data):
+        """Rebuild a record from to_dict() output"""
+        return cls(path, **{field: data.get(field) for field in cls.CACHED_FIELDS if field in data})
+    
+    def __repr__(self):
+        return (f"VideoInfo({self.filename!r}, {self.width}x{self.height}, "
+                f"{self.fps:.3f}fps, {self.frame_count} frames)")
+
+# Only open a seeked second input when it skips at least this much decoding
+TAIL_SEEK_MIN_SECONDS = 2.0
+
+# Smart render (MP4 from H.264 only): re-encode the crossfade and boundary GOPs and
+# stream-copy the rest, when the clip is long enough and most of it is copyable
+SMART_RENDER_MIN_SECONDS = 20.0
+SMART_RENDER_MIN_COPY_FRACTION = 0.5
+# ffprobe H.264 profile names -> libx264 -profile:v; re-encoded GOPs must match the copied ones
+SMART_RENDER_PROFILES = {'Constrained Baseline': 'baseline', 'Baseline': 'baseline', 'Main': 'main', 'High': 'high'}
+
+# Output format choices: each maps to the encoders fed from one decode
+OUTPUT_FORMAT_CHOICES = {
+    "HAP": ["HAP"],
+    "MP4": ["MP4"],
+    "HAP + MP4": ["HAP", "MP4"],
+    "HAP + MP4 + PROXY": ["HAP", "MP4", "PROXY"],
+}
+OUTPUT_SUFFIXES = {"HAP": "_LOOPER.mov", "MP4": "_LOOPER.mp4", "PROXY": "_LOOPER_proxy.mp4"}
+# Muxer per format, passed explicitly because renders go to .partial paths ffmpeg can't guess from
+OUTPUT_MUXERS = {"HAP": "mov", "MP4": "mp4", "PROXY": "mp4"}
+PROXY_HEIGHT = 540
+PROXY_CRF = "28"
+
+# HAP encoder profile: variant -> hap -format value (the encoder only takes rgba input)
+HAP_VARIANTS = {
+    'Hap': 'hap',
+    'HapQ': 'hap_q',
+    'HapAlpha': 'hap_alpha',
+}
+HAP_COMPRESSORS = ('snappy', 'none')
+HAP_MAX_CHUNKS = 64  # ffmpeg's limit for -chunks
+HAP_BENCHMARK_SECONDS = 5.0
+
+# Segment-parallel rendering of a single long input
+SEGMENT_RENDER_MIN_SECONDS = 120.0
+SEGMENT_RENDER_MAX_AUTO_WORKERS = 16
+
+def plan_thread_budget(total_cores, concurrent_processes):
+    """Split one process's share of the cores into (decode, filter, encode) thread counts.
+    
+    The encoder gets the bulk; each stage gets at least one thread, so tiny shares may
+    oversubscribe slightly rather than starve a stage.
+    """
+    per_process = max(1, total_cores // max(1, concurrent_processes))
+    decode = max(1, per_process // 4)
+    filters = max(1, per_process // 4)
+    encode = max(1, per_process - decode - filters)
+    return decode, filters, encode
+
+# Render backends: 'filter' composites in the ffmpeg graph, 'pipe' blends raw frames in NumPy
+RENDER_BACKENDS = ('filter', 'pipe')
+
+# Pixel formats carrying an alpha plane (decoded to yuva420p rather than yuv420p for the pipe backend)
+ALPHA_PIX_FMT_PREFIXES = ('yuva', 'rgba', 'bgra', 'argb', 'abgr', 'gbrap', 'ya8', 'ya16', 'pal8')
+
+def has_alpha(pix_fmt):
+    """Whether an ffprobe pixel format name carries alpha"""
+    return bool(pix_fmt) and pix_fmt.startswith(ALPHA_PIX_FMT_PREFIXES)
+
+def read_exact(stream, view):
+    """Fill a memoryview from a pipe; False if the stream ends first"""
+    filled = 0
+    while filled < len(view):
+        n = stream.readinto(view[filled:])
+        if not n:
+            return False
+        filled += n
+    return True
+
+# Preflight: frames rendered past the crossfade before a full render
+PREFLIGHT_EXTRA_FRAMES = 3
+
+def keyframe_at_or_before(keyframes, t):
+    """Latest keyframe time <= t (0.0 if there is none)"""
+    i = bisect.bisect_right(keyframes, t + 1e-6)
+    return keyframes[i - 1] if i else 0.0
+
+def keyframe_at_or_after(keyframes, t):
+    """Earliest keyframe time >= t, or None past the last keyframe"""
+    i = bisect.bisect_left(keyframes, t - 1e-6)
+    return keyframes[i] if i < len(keyframes) else None
+
+# ffmpeg failure classes, matched per stderr line (first hit in this order wins for a line)
+FAILURE_PATTERNS = (
+    ('disk_full', re.compile(r'No space left on device|Disk quota exceeded', re.I)),
+    ('permission', re.compile(r'Permission denied|Operation not permitted|Access is denied', re.I)),
+    ('missing_encoder', re.compile(r'Unknown encoder|Encoder not found|Error selecting an encoder|'
+                                   r'Automatic encoder selection failed', re.I)),
+    ('corrupt_input', re.compile(r'Invalid data found when processing input|moov atom not found|'
+                                 r'could not find codec parameters', re.I)),
+    # Usually a missing intermediate (segment, concat part, work dir), not the source
+    ('missing_file', re.compile(r'No such file or directory', re.I)),
+    ('bad_timestamps', re.compile(r'Non-monotonous DTS|non monotonically increasing dts|'
+                                  r'Timestamps are unset|Invalid timestamp', re.I)),
+    ('filter_graph', re.compile(r'Error (?:re)?initializing (?:complex )?filters?|'
+                                r'Failed to configure (?:input|output) pad|No such filter', re.I)),
+)
+
+# Render attempts in the fallback chain (see LooperApp.process_single_video)
+RENDER_ATTEMPTS = ('multi', 'smart', 'segmented', 'complex', 'pipe', 'simple', 'copy')
+
+# Attempts that cannot succeed after a failure of the given class. Encoder, input and
+# filesystem problems doom every attempt; graph and timestamp problems only doom the
+# attempts that share the failing graph or stream-copy the bad timestamps.
+FAILURE_SKIPS = {
+    'disk_full': set(RENDER_ATTEMPTS),
+    'permission': set(RENDER_ATTEMPTS),
+    'missing_encoder': set(RENDER_ATTEMPTS),
+    'corrupt_input': set(RENDER_ATTEMPTS),
+    'missing_file': set(),  # a lost intermediate only dooms the attempt that wrote it
+    'bad_timestamps': {'smart', 'segmented'},  # both join parts with the concat demuxer
+    'filter_graph': {'multi', 'smart', 'segmented', 'complex'},
+    'cancelled': set(RENDER_ATTEMPTS),  # set by JobController, not matched from stderr
+}
+FATAL_FAILURES = {name for name, skips in FAILURE_SKIPS.items() if skips == set(RENDER_ATTEMPTS)}
+
+def classify_ffmpeg_failure(stderr_lines):
+    """Failure class for a failed ffmpeg run (see FAILURE_PATTERNS), or 'unknown'.
+    
+    ffmpeg prints the error that stopped it after any warnings (e.g. timestamp or decode
+    warnings ahead of a graph error), so lines are read from the end and the last match wins.
+    """
+    for line in reversed(''.join(stderr_lines).splitlines()):
+        for failure_class, pattern in FAILURE_PATTERNS:
+            if pattern.search(line):
+                return failure_class
+    return 'unknown'
+
+class RenderJob:
+    """One input rendered to one or more output formats, with the outcome of each attempt"""
+    
+    __slots__ = ('video_info', 'outputs', 'strategy', 'failure_class', 'attempts', 'wasted_seconds')
+    
+    def __init__(self, video_info, outputs):
+        self.video_info = video_info
+        self.outputs = dict(outputs)  # {output_format: output_path}
+        self.strategy = None  # name of the attempt that produced the outputs
+        self.failure_class = None  # class of the most recent failure
+        self.attempts = []  # (attempt name, failure class, seconds) for each failed attempt
+        self.wasted_seconds = 0.0  # time spent on attempts that failed
+    
+    @property
+    def succeeded(self):
+        return self.strategy is not None
+    
+    def record_failure(self, attempt, failure_class, seconds):
+        self.attempts.append((attempt, failure_class, seconds))
+        self.failure_class = failure_class
+        self.wasted_seconds += seconds
+    
+    def __repr__(self):
+        return (f"RenderJob({self.video_info.filename!r}, {'+'.join(self.outputs)}, "
+                f"strategy={self.strategy}, wasted={self.wasted_seconds:.1f}s)")
+
+# Renders are written to a sibling with a non-media extension (so watch folders ignore it)
+# and only renamed over the final path on success, so an existing _LOOPER file is always complete
+PARTIAL_OUTPUT_TAG = '.partial'
+
+def partial_output_path(output_path):
+    """Temp path in the same directory, so the final rename is atomic"""
+    return output_path + PARTIAL_OUTPUT_TAG
+
+def commit_output(partial_path, output_path):
+    """Flush a finished render to disk and atomically move it to its final path"""
+    with open(partial_path, 'rb+') as f:
+        os.fsync(f.fileno())
+    os.replace(partial_path, output_path)
+    if os.name != 'nt':
+        # Persist the rename itself; directories cannot be opened for fsync on Windows
+        dir_fd = os.open(os.path.dirname(output_path) or '.', os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+# Smart/segmented render parts go to the system temp dir, never next to the outputs (which
+# may be a watched input folder); dirs a crashed or killed run left behind go at startup
+WORK_DIR_PREFIXES = ('looper_smart_', 'looper_segments_')
+STALE_WORK_DIR_SECONDS = 6 * 3600
+
+def remove_stale_work_dirs():
+    """Delete render work dirs older than STALE_WORK_DIR_SECONDS from the temp dir"""
+    temp_root = tempfile.gettempdir()
+    cutoff = time.time() - STALE_WORK_DIR_SECONDS
+    try:
+        names = os.listdir(temp_root)
+    except OSError:
+        return
+    for name in names:
+        if not name.startswith(WORK_DIR_PREFIXES):
+            continue
+        path = os.path.join(temp_root, name)
+        try:
+            if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                print(f"🧹 Removed stale render work dir {path}")
+        except OSError:
+            continue
+
+# Batch scheduler: auto slot count assumes a 1080p job keeps this many cores busy
+JOB_CORES_PER_1080P = 4
+MAX_AUTO_CONCURRENT_JOBS = 8
+# Seconds a cancelled ffmpeg gets to exit after SIGTERM before it is killed
+JOB_TERMINATE_TIMEOUT = 3.0
+
+class JobController:
+    """Tracks the ffmpeg children of running jobs so they can be cancelled, paused and resumed.
+    
+    Jobs are identified by their queue index. Processes register themselves for the
+    lifetime of the Popen; cancelling terminates them at once, which makes the render
+    attempt fail and frees the scheduler slot. Pausing suspends every child (SIGSTOP on
+    POSIX, NtSuspendProcess on Windows) and holds queued jobs until resume().
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.processes = {}  # job index -> set of running Popen objects
+        self.cancelled = set()
+        self.batch_cancelled = False
+        self.running = threading.Event()
+        self.running.set()  # cleared while paused
+    
+    def reset(self):
+        with self.lock:
+            self.processes.clear()
+            self.cancelled.clear()
+            self.batch_cancelled = False
+        self.running.set()
+    
+    @property
+    def paused(self):
+        return not self.running.is_set()
+    
+    def register(self, job_index, process):
+        with self.lock:
+            self.processes.setdefault(job_index, set()).add(process)
+            cancelled = self.batch_cancelled or job_index in self.cancelled
+        if cancelled:
+            self._terminate([process])
+        elif self.paused:
+            self._signal(process, suspend=True)
+    
+    def unregister(self, job_index, process):
+        with self.lock:
+            self.processes.get(job_index, set()).discard(process)
+    
+    def is_cancelled(self, job_index):
+        with self.lock:
+            return self.batch_cancelled or job_index in self.cancelled
+    
+    def cancel(self, job_index=None):
+        """Cancel one job, or the whole batch when job_index is None"""
+        with self.lock:
+            if job_index is None:
+                self.batch_cancelled = True
+                targets = [p for procs in self.processes.values() for p in procs]
+            else:
+                self.cancelled.add(job_index)
+                targets = list(self.processes.get(job_index, ()))
+        self._terminate(targets)
+    
+    def stop(self, job_index):
+        """Terminate a job's running processes without cancelling the job (e.g. an aborted attempt)"""
+        with self.lock:
+            targets = list(self.processes.get(job_index, ()))
+        self._terminate(targets)
+    
+    def pause(self):
+        self.running.clear()
+        for process in self._all_processes():
+            self._signal(process, suspend=True)
+    
+    def resume(self):
+        for process in self._all_processes():
+            self._signal(process, suspend=False)
+        self.running.set()
+    
+    def wait_while_paused(self):
+        """Block a job that has not started yet until the batch is resumed"""
+        self.running.wait()
+    
+    def _all_processes(self):
+        with self.lock:
+            return [p for procs in self.processes.values() for p in procs]
+    
+    def _terminate(self, processes):
+        """Ask every process to exit at once; a reaper thread kills stragglers, so the caller never blocks"""
+        stopping = []
+        for process in processes:
+            if process.poll() is not None:
+                continue
+            try:
+                self._signal(process, suspend=False)  # a stopped process can't handle SIGTERM
+                process.terminate()
+                stopping.append(process)
+            except OSError as e:
+                print(f"Could not terminate ffmpeg (pid {process.pid}): {e}")
+        if stopping:
+            threading.Thread(target=self._reap, args=(stopping,), daemon=True).start()
+    
+    @staticmethod
+    def _reap(processes):
+        deadline = time.monotonic() + JOB_TERMINATE_TIMEOUT
+        for process in processes:
+            try:
+                process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                try:
+                    process.kill()
+                except OSError as e:
+                    print(f"Could not kill ffmpeg (pid {process.pid}): {e}")
+    
+    @staticmethod
+    def _signal(process, suspend):
+        if process.poll() is not None:
+            return
+        try:
+            if os.name == 'nt':
+                import ctypes
+                ntdll = ctypes.windll.ntdll
+                (ntdll.NtSuspendProcess if suspend else ntdll.NtResumeProcess)(int(process._handle))
+            else:
+                import signal
+                os.kill(process.pid, signal.SIGSTOP if suspend else signal.SIGCONT)
+        except (OSError, AttributeError) as e:
+            print(f"Could not {'pause' if suspend else 'resume'} ffmpeg (pid {process.pid}): {e}")
+
+
+# Memory admission: each job's peak memory is estimated from its frame size and how many
+# frames every stage holds, and the scheduler only starts jobs whose estimate fits
+MEMORY_HEADROOM = 0.8  # fraction of available memory the scheduler may commit
+JOB_BASE_MEMORY = 96 * 1024 * 1024  # per-job ffmpeg/Python overhead, independent of resolution
+DECODER_BUFFERED_FRAMES = 16  # frame-threaded decoder pool
+GRAPH_QUEUE_FRAMES = 8  # frames in flight between filters
+ENCODER_BUFFERED_FRAMES = {'HAP': 4, 'MP4': 48, 'PROXY': 48}  # x264 lookahead and references
+MEMORY_POLL_SECONDS = 1.0
+# (pix_fmt prefix, bytes per pixel at 8 bits), most specific first
+PIX_FMT_BYTES = (
+    ('yuva444', 4.0), ('yuva422', 3.0), ('yuva420', 2.5),
+    ('rgba', 4.0), ('bgra', 4.0), ('argb', 4.0), ('abgr', 4.0), ('gbrap', 4.0),
+    ('rgb0', 4.0), ('bgr0', 4.0), ('0rgb', 4.0), ('0bgr', 4.0),
+    ('rgb', 3.0), ('bgr', 3.0), ('gbrp', 3.0),
+    ('yuv444', 3.0), ('yuvj444', 3.0), ('yuv422', 2.0), ('yuvj422', 2.0), ('uyvy422', 2.0), ('yuyv422', 2.0),
+)
+
+def pix_fmt_bytes(pix_fmt):
+    """Approximate bytes per pixel of an ffmpeg pixel format (4:2:0 8-bit when unknown)"""
+    pix_fmt = pix_fmt or ''
+    size = next((b for prefix, b in PIX_FMT_BYTES if pix_fmt.startswith(prefix)), 1.5)
+    if re.search(r'(9|10|12|14|16)(le|be)?$', pix_fmt) or pix_fmt.startswith(('p010', 'p016', 'rgb48', 'rgba64')):
+        size *= 2  # high bit depth is stored in 16-bit words
+    return size
+
+def estimate_job_memory(video_info, formats, graph_frames, pipelines=1):
+    """Estimated peak bytes for rendering one input to formats.
+    
+    graph_frames is how many frames the filter graph may queue; the graph runs in an
+    alpha-capable format for the crossfade, so those frames are sized as yuva420p at least.
+    pipelines multiplies everything for segment-parallel renders.
+    """
+    pixels = video_info.width * video_info.height
+    source_bytes = pix_fmt_bytes(video_info.pix_fmt)
+    total = DECODER_BUFFERED_FRAMES * pixels * source_bytes
+    total += graph_frames * pixels * max(pix_fmt_bytes('yuva420p'), source_bytes)
+    for fmt in formats:
+        if fmt == "PROXY":
+            scale = min(1.0, PROXY_HEIGHT / max(1, video_info.height))
+            frame_bytes = pixels * scale * scale * 1.5
+        elif fmt == "HAP":
+            frame_bytes = pixels * 4.0  # rgba texture input
+        else:
+            frame_bytes = pixels * 1.5
+        total += ENCODER_BUFFERED_FRAMES.get(fmt, GRAPH_QUEUE_FRAMES) * frame_bytes
+    return int(pipelines * (JOB_BASE_MEMORY + total))
+
+def available_memory_bytes():
+    """Memory the OS can hand out without swapping, or None where it cannot be read"""
+    try:
+        if os.name == 'nt':
+            import ctypes
+            
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [
+                    ('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                    ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                    ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                    ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                    ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+                ]
+            
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return status.ullAvailPhys
+            return None
+        with open('/proc/meminfo', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+class MemoryGate:
+    """Holds jobs back until their estimated peak memory fits next to the running ones.
+    
+    The budget is MEMORY_HEADROOM of the available memory, read whenever no job holds a
+    reservation (live usage would count running jobs twice). A job is always admitted
+    when nothing else is running, so an oversized job runs alone rather than never.
+    Without a readable memory figure every job is admitted.
+    """
+    
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.reserved = {}  # job index -> reserved bytes
+        self.budget = None
+    
+    def acquire(self, job_index, need, timeout=None):
+        """Reserve need bytes for a job; False if that did not fit within timeout"""
+        with self.condition:
+            def fits():
+                if not self.reserved:
+                    available = available_memory_bytes()
+                    self.budget = available * MEMORY_HEADROOM if available else None
+                    return True
+                return self.budget is None or sum(self.reserved.values()) + need <= self.budget
+            if not self.condition.wait_for(fits, timeout):
+                return False
+            self.reserved[job_index] = need
+            return True
+    
+    def release(self, job_index):
+        with self.condition:
+            if self.reserved.pop(job_index, None) is not None:
+                self.condition.notify_all()
+
+
+# Persistent metadata cache, stored next to looper_settings.json
+CACHE_DB_FILE = 'looper_cache.db'
+PROBE_CACHE_MAX_ENTRIES = 20000
+
+class ProbeCache:
+    """SQLite store of probe results keyed by path, size and mtime.
+    
+    Entries are invalidated when the file's size or mtime changes, and the
+    least recently used rows are pruned once the table exceeds max_entries.
+    Keyframe indexes live in a second table keyed by content fingerprint, so
+    they survive renames. Every method swallows database errors - a broken
+    cache must never stop probing.
+    """
+    
+    def __init__(self, db_path, max_entries=PROBE_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS probe_cache ("
+            "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+            "info TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        # Clean entry points only; the old keyframe_index table also held open-GOP keyframes
+        self.conn.execute("DROP TABLE IF EXISTS keyframe_index")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entry_points ("
+            "fingerprint TEXT PRIMARY KEY, times TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.conn.commit()
+    
+    @staticmethod
+    def _stat_key(path):
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+    
+    def get(self, path):
+        """Return the cached VideoInfo for an unchanged file, or None"""
+        try:
+            size, mtime_ns = self._stat_key(path)
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT size, mtime_ns, info FROM probe_cache WHERE path = ?", (path,)
+                ).fetchone()
+                if row is None:
+                    return None
+                data = json.loads(row[2])
+                if row[0] != size or row[1] != mtime_ns or not set(VideoInfo.CACHED_FIELDS) <= data.keys():
+                    # File changed on disk, or the entry predates a field - drop it and re-probe
+                    self.conn.execute("DELETE FROM probe_cache WHERE path = ?", (path,))
+                    self.conn.commit()
+                    return None
+                self.conn.execute(
+                    "UPDATE probe_cache SET last_used = ? WHERE path = ?", (time.time(), path)
+                )
+                self.conn.commit()
+            return VideoInfo.from_dict(path, data)
+        except (OSError, sqlite3.Error, ValueError, TypeError) as e:
+            print(f"Probe cache read failed for {path}: {e}")
+            return None
+    
+    def put(self, path, info):
+        """Store a VideoInfo for a file at its current size and mtime"""
+        try:
+            size, mtime_ns = self._stat_key(path)
+            payload = json.dumps(info.to_dict())
+            with self.lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO probe_cache (path, size, mtime_ns, info, last_used) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (path, size, mtime_ns, payload, time.time())
+                )
+                self._prune()
+                self.conn.commit()
+        except (OSError, sqlite3.Error, TypeError) as e:
+            print(f"Probe cache write failed for {path}: {e}")
+    
+    def _prune(self, table='probe_cache', key='path'):
+        """Evict least recently used rows beyond max_entries (caller holds the lock)"""
+        count = self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                f"DELETE FROM {table} WHERE {key} IN "
+                f"(SELECT {key} FROM {table} ORDER BY last_used ASC LIMIT ?)", (excess,)
+            )
+    
+    def get_keyframes(self, fingerprint):
+        """Return the cached keyframe times (seconds) for a content fingerprint, or None"""
+        try:
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT times FROM entry_points WHERE fingerprint = ?", (fingerprint,)
+                ).fetchone()
+                if row is None:
+                    return None
+                self.conn.execute(
+                    "UPDATE entry_points SET last_used = ? WHERE fingerprint = ?", (time.time(), fingerprint)
+                )
+                self.conn.commit()
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Keyframe index read failed for {fingerprint}: {e}")
+            return None
+    
+    def put_keyframes(self, fingerprint, times):
+        """Store keyframe times for a content fingerprint"""
+        try:
+            with self.lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO entry_points (fingerprint, times, last_used) VALUES (?, ?, ?)",
+                    (fingerprint, json.dumps(times), time.time())
+                )
+                self._prune('entry_points', 'fingerprint')
+                self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"Keyframe index write failed for {fingerprint}: {e}")
+    
+    def invalidate(self, path):
+        """Forget a single file"""
+        try:
+            with self.lock:
+                self.conn.execute("DELETE FROM probe_cache WHERE path = ?", (path,))
+                self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"Probe cache invalidate failed for {path}: {e}")
+    
+    def clear(self):
+        """Drop every cached entry"""
+        try:
+            with self.lock:
+                self.conn.execute("DELETE FROM probe_cache")
+                self.conn.execute("DELETE FROM entry_points")
+                self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"Probe cache clear failed: {e}")
+
+# Finished renders, stored by content key next to looper_settings.json
+RENDER_CACHE_DIR = 'looper_render_cache'
+RENDER_CACHE_MAX_GB = 20.0
+# Bump whenever a change to the render paths changes their output, to invalidate old entries
+RENDER_ENGINE_VERSION = 3
+# Only these attempts produce the real crossfade loop; fallback outputs are never cached
+CACHEABLE_STRATEGIES = ('multi', 'smart', 'segmented', 'complex', 'pipe')
+
+class RenderCache:
+    """Content-addressed store of finished renders, evicted least recently used by total size.
+    
+    Keys hash the input fingerprint and every setting that changes the output (see
+    LooperApp.render_cache_key). The index lives in the probe cache database; the files
+    live in cache_dir. Hits are hard-linked to the output path when possible, copied
+    otherwise. Like ProbeCache, errors are logged and treated as misses.
+    """
+    
+    def __init__(self, db_path, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS render_cache ("
+            "key TEXT PRIMARY KEY, file TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.conn.commit()
+    
+    @staticmethod
+    def make_key(**parts):
+        """Stable hex key for a dict of JSON-serialisable render parameters"""
+        payload = json.dumps(parts, sort_keys=True).encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _link_or_copy(src, dst):
+        if os.path.exists(dst):
+            os.remove(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)  # different volume, or links unsupported
+    
+    def fetch(self, key, output_path):
+        """Materialise a cached render at output_path; False on a miss"""
+        try:
+            with self.lock:
+                row = self.conn.execute("SELECT file FROM render_cache WHERE key = ?", (key,)).fetchone()
+                cached = os.path.join(self.cache_dir, row[0]) if row else None
+                if cached and not os.path.exists(cached):
+                    # File was removed behind our back - drop the stale entry
+                    self.conn.execute("DELETE FROM render_cache WHERE key = ?", (key,))
+                    self.conn.commit()
+                    cached = None
+                if cached is None:
+                    self.misses += 1
+                    return False
+                self._link_or_copy(cached, output_path)
+                self.conn.execute("UPDATE render_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+                self.conn.commit()
+                self.hits += 1
+                return True
+        except (OSError, sqlite3.Error) as e:
+            print(f"Render cache read failed for {output_path}: {e}")
+            self.misses += 1
+            return False
+    
+    def store(self, key, output_path):
+        """Add a finished render to the cache, then evict down to max_bytes"""
+        try:
+            file_name = key + os.path.splitext(output_path)[1]
+            cached = os.path.join(self.cache_dir, file_name)
+            with self.lock:
+                self._link_or_copy(output_path, cached)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO render_cache (key, file, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, file_name, os.path.getsize(cached), time.time())
+                )
+                self._evict()
+                self.conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Render cache write failed for {output_path}: {e}")
+    
+    def _evict(self):
+        """Delete least recently used renders until the total fits max_bytes (caller holds the lock)"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM render_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, file_name, size in self.conn.execute(
+            "SELECT key, file, size FROM render_cache ORDER BY last_used ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, file_name))
+            except OSError:
+                pass
+            self.conn.execute("DELETE FROM render_cache WHERE key = ?", (key,))
+            total -= size
+    
+    def status_text(self):
+        return f"💾 Render cache: {self.hits} hits, {self.misses} misses"
+
+# Job ordering: 'queue' keeps drop order, 'shortest' returns quick results first,
+# 'longest' starts big jobs early so concurrent slots finish together
+JOB_ORDER_POLICIES = ('queue', 'shortest', 'longest')
+# Relative render cost per output megapixel-second, by output format and by input codec
+OUTPUT_COST_FACTORS = {'HAP': 1.0, 'MP4': 2.5, 'PROXY': 0.4}
+INPUT_COST_FACTORS = {'hevc': 1.6, 'av1': 1.8, 'vp9': 1.4, 'prores': 1.3, 'h264': 1.0}
+COST_HISTORY_WEIGHT = 0.3  # weight of the newest measurement in the moving average
+
+class CostModel:
+    """Estimated render seconds per job: duration x pixels x codec factors, scaled by history.
+    
+    The static estimate is in arbitrary cost units; each finished render updates a moving
+    average of seconds per unit for its output formats, persisted next to the caches so
+    estimates improve across sessions. Errors are logged and ignored.
+    """
+    
+    def __init__(self, db_path):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS render_cost ("
+            "formats TEXT PRIMARY KEY, seconds_per_unit REAL NOT NULL, samples INTEGER NOT NULL)"
+        )
+        self.conn.commit()
+        self.rates = dict(
+            (formats, rate) for formats, rate in self.conn.execute("SELECT formats, seconds_per_unit FROM render_cost")
+        )
+    
+    @staticmethod
+    def cost_units(video_info, formats):
+        megapixel_seconds = video_info.duration * video_info.width * video_info.height / 1e6
+        input_factor = INPUT_COST_FACTORS.get(video_info.codec_name, 1.2)
+        return megapixel_seconds * input_factor * sum(OUTPUT_COST_FACTORS.get(fmt, 1.0) for fmt in formats)
+    
+    def estimate(self, video_info, formats):
+        """Estimated seconds (or bare cost units until a render of these formats was measured)"""
+        key = '+'.join(formats)
+        return self.cost_units(video_info, formats) * self.rates.get(key, 1.0)
+    
+    def observe(self, video_info, formats, seconds):
+        """Fold a measured render time into the seconds-per-unit average for these formats"""
+        units = self.cost_units(video_info, formats)
+        if units <= 0 or seconds <= 0:
+            return
+        key = '+'.join(formats)
+        try:
+            with self.lock:
+                old = self.rates.get(key)
+                rate = seconds / units if old is None else old + COST_HISTORY_WEIGHT * (seconds / units - old)
+                self.rates[key] = rate
+                self.conn.execute(
+                    "INSERT INTO render_cost (formats, seconds_per_unit, samples) VALUES (?, ?, 1) "
+                    "ON CONFLICT(formats) DO UPDATE SET seconds_per_unit = excluded.seconds_per_unit, "
+                    "samples = samples + 1",
+                    (key, rate)
+                )
+                self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"Cost history write failed for {key}: {e}")
+
+# Crash-safe batch journal, in the same database as the caches
+JOURNAL_MAX_BATCHES = 50  # finished batches kept for reference before pruning
+UNFINISHED_JOB_STATES = ('queued', 'running')  # terminal states: done, failed, cancelled
+
+class JobJournal:
+    """Durable record of batch jobs and their state transitions (queued, running, done, failed, cancelled).
+    
+    Every transition is its own committed SQLite transaction with synchronous=FULL, so
+    after a crash the journal shows exactly which jobs finished. A batch whose finished
+    time was never written was interrupted; interrupted_batch() returns its unfinished
+    jobs and the settings it was started with. Errors are logged and ignored - a broken
+    journal must never stop rendering.
+    """
+    
+    def __init__(self, db_path):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_batches ("
+            "batch_id TEXT PRIMARY KEY, settings TEXT NOT NULL, created REAL NOT NULL, finished REAL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_journal ("
+            "batch_id TEXT NOT NULL, input_path TEXT NOT NULL, outputs TEXT NOT NULL, "
+            "state TEXT NOT NULL, updated REAL NOT NULL, PRIMARY KEY (batch_id, input_path))"
+        )
+        self.conn.commit()
+    
+    def start_batch(self, settings, jobs):
+        """Record a new batch of (input_path, {format: output_path}) jobs as queued; returns its id"""
+        batch_id = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        now = time.time()
+        try:
+            with self.lock:
+                self.conn.execute(
+                    "INSERT INTO job_batches (batch_id, settings, created) VALUES (?, ?, ?)",
+                    (batch_id, json.dumps(settings), now)
+                )
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO job_journal (batch_id, input_path, outputs, state, updated) "
+                    "VALUES (?, ?, ?, 'queued', ?)",
+                    [(batch_id, path, json.dumps(outputs), now) for path, outputs in jobs]
+                )
+                self.conn.commit()
+        except (sqlite3.Error, TypeError) as e:
+            print(f"Job journal write failed for batch {batch_id}: {e}")
+        return batch_id
+    
+    def add_jobs(self, batch_id, jobs):
+        """Record (input_path, {format: output_path}) jobs that joined a running batch as queued"""
+        now = time.time()
+        try:
+            with self.lock:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO job_journal (batch_id, input_path, outputs, state, updated) "
+                    "VALUES (?, ?, ?, 'queued', ?)",
+                    [(batch_id, path, json.dumps(outputs), now) for path, outputs in jobs]
+                )
+                self.conn.commit()
+        except (sqlite3.Error, TypeError) as e:
+            print(f"Job journal write failed for batch {batch_id}: {e}")
+    
+    def set_state(self, batch_id, input_path, state):
+        try:
+            with self.lock:
+                self.conn.execute(
+                    "UPDATE job_journal SET state = ?, updated = ? WHERE batch_id = ? AND input_path = ?",
+                    (state, time.time(), batch_id, input_path)
+                )
+                self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"Job journal update failed for {input_path}: {e}")
+    
+    def finish_batch(self, batch_id):
+        """Mark a batch complete (or abandoned) and prune old batches"""
+        try:
+            with self.lock:
+                self.conn.execute("UPDATE job_batches SET finished = ? WHERE batch_id = ?", (time.time(), batch_id))
+                old = [row[0] for row in self.conn.execute(
+                    "SELECT batch_id FROM job_batches WHERE finished IS NOT NULL "
+                    "ORDER BY created DESC LIMIT -1 OFFSET ?", (JOURNAL_MAX_BATCHES,)
+                )]
+                for old_id in old:
+                    self.conn.execute("DELETE FROM job_journal WHERE batch_id = ?", (old_id,))
+                    self.conn.execute("DELETE FROM job_batches WHERE batch_id = ?", (old_id,))
+                self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"Job journal finish failed for batch {batch_id}: {e}")
+    
+    @staticmethod
+    def outputs_written_since(output_paths, since):
+        try:
+            return all(os.path.getmtime(path) >= since for path in output_paths)
+        except OSError:
+            return False  # at least one output is missing
+    
+    def interrupted_batch(self):
+        """(batch_id, settings, [(input_path, outputs)] unfinished, total jobs) for the latest interrupted batch, or None"""
+        try:
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT batch_id, settings FROM job_batches WHERE finished IS NULL ORDER BY created DESC LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    return None
+                batch_id, settings = row
+                jobs = self.conn.execute(
+                    "SELECT input_path, outputs, state, updated FROM job_journal WHERE batch_id = ? ORDER BY rowid",
+                    (batch_id,)
+                ).fetchall()
+            unfinished = []
+            for path, outputs, state, updated in jobs:
+                if state not in UNFINISHED_JOB_STATES:
+                    continue
+                outputs = json.loads(outputs)
+                if state == 'running' and self.outputs_written_since(outputs.values(), updated):
+                    # Outputs are renamed into place only when complete, so the render
+                    # finished and only its 'done' transition was lost
+                    self.set_state(batch_id, path, 'done')
+                    continue
+                unfinished.append((path, outputs))
+            if not unfinished:
+                self.finish_batch(batch_id)  # every job reached a final state - only the footer was lost
+                return None
+            return batch_id, json.loads(settings), unfinished, len(jobs)
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Job journal read failed: {e}")
+            return None
+
 # Optional: stable taskbar identity so Windows ties the window to your EXE icon
 try:
     import ctypes
@@ -83,15 +1055,75 @@ class LooperApp:
         self.video_infos = []  # List of video info dictionaries
         self.output_paths = []  # List of output paths
         self.current_processing_index = 0
+        self.analysis_failures = []  # (path, error) pairs from the last analysis
+        self.keyframe_indexes = {}  # fingerprint -> sorted keyframe times, see get_keyframe_index
+        
+        # Background queue population: a producer thread probes files and posts
+        # ('row' | 'error' | 'done', path, payload) tuples for the Tk thread to drain
+        self.scan_requests = queue.Queue()
+        self.scan_results = queue.Queue()
+        self.scan_lock = threading.Lock()
+        self.scan_thread = None
+        self.is_scanning = False
+        self.scan_added = 0
+        self.scan_duplicates = []  # (path, queued filename) skipped as same content
+        
+        # Rows probed while a batch runs join it: batch_target is (output_dir, formats) while
+        # the batch still accepts rows, and new queue indexes reach the scheduler via batch_additions
+        self.batch_lock = threading.Lock()
+        self.batch_target = None
+        self.batch_additions = queue.Queue()
+        
+        # Persistent probe metadata cache (optional - app works without it)
+        try:
+            self.probe_cache = ProbeCache(CACHE_DB_FILE)
+        except sqlite3.Error as e:
+            print(f"⚠️ Probe cache unavailable: {e}")
+            self.probe_cache = None
+        self.render_cache = None  # RenderCache, opened in load_settings once its size limit is known
+        
+        # Crash-safe batch journal (optional - batches just can't be resumed without it)
+        try:
+            self.job_journal = JobJournal(CACHE_DB_FILE)
+        except sqlite3.Error as e:
+            print(f"⚠️ Job journal unavailable: {e}")
+            self.job_journal = None
+        self.batch_id = None  # journal id of the running batch
+        try:
+            self.cost_model = CostModel(CACHE_DB_FILE)
+        except sqlite3.Error as e:
+            print(f"⚠️ Cost history unavailable: {e}")
+            self.cost_model = None
+        self.journal_paths = []  # journal key (input path) of each job in the running batch
+        self.resume_outputs = None  # {path_key(input): outputs} while an interrupted batch is re-queued
+        remove_stale_work_dirs()  # parts of renders a crash or kill interrupted
         
         # Processing state
         self.is_processing = False
+        self.job_context = threading.local()  # per scheduler thread: queue row, progress totals, last failure
+        self.job_controller = JobController()  # cancel / pause / resume of running jobs
         self.current_video_duration = 0  # For progress calculation
+        self.last_failure_class = None  # classify_ffmpeg_failure() of the last failed ffmpeg run
         
         # FFmpeg detection state
         self.ffmpeg_available = False
         self.ffmpeg_hap_ready = False  # whether ffmpeg has HAP encoder
         self.ffmpeg_exe = None   # absolute path to ffmpeg once found
+        self.ffprobe_exe = None  # absolute path to the ffprobe next to it, if any
+        self.ffmpeg_version = None  # first line of ffmpeg -version, part of render cache keys
+        self.probe_mode = 'fast'  # one of PROBE_MODES, persisted in settings
+        self.smart_render_enabled = True  # stream-copy untouched GOPs where possible
+        self.segment_workers = 0  # parallel segments for long inputs (0 = auto, 1 = off)
+        self.preflight_enabled = True  # test-render a few frames before each full render
+        self.thread_cores = 0  # cores shared out by the thread budget (0 = all)
+        self.render_backend = 'filter'  # one of RENDER_BACKENDS, tried first for the full loop
+        self.render_cache_enabled = True  # reuse finished renders of unchanged inputs and settings
+        self.render_cache_max_gb = RENDER_CACHE_MAX_GB
+        self.render_concurrency = 1  # jobs rendering at once; each gets 1/N of the thread budget
+        self.concurrent_jobs = 0  # scheduler slots (0 = auto from cores and resolution)
+        self.job_order = 'queue'  # one of JOB_ORDER_POLICIES
+        self.memory_admission = True  # hold jobs back until their estimated memory fits
+        self.memory_gate = MemoryGate()
         self.ff_has_hap = False  # whether ffmpeg supports HAP encoding
         self.ffmpeg_status_label = None
         self.ffmpeg_install_prompt_shown = False  # Prevent infinite prompts
@@ -105,9 +1137,37 @@ class LooperApp:
         # Check initial format after settings are loaded
         self.root.after(100, self.check_initial_format)
         
+        # Offer to finish a batch the last session didn't
+        self.root.after(500, self.offer_batch_resume)
+        
         # Bind resize event to update progress bar
         self.root.bind('<Configure>', self.on_window_resize)
         
+    # Render state that differs per scheduler thread lives in job_context
+    @property
+    def current_video_duration(self):
+        return getattr(self.job_context, 'duration', 0)
+    
+    @current_video_duration.setter
+    def current_video_duration(self, value):
+        self.job_context.duration = value
+    
+    @property
+    def current_video_frames(self):
+        return getattr(self.job_context, 'frames', 0)
+    
+    @current_video_frames.setter
+    def current_video_frames(self, value):
+        self.job_context.frames = value
+    
+    @property
+    def last_failure_class(self):
+        return getattr(self.job_context, 'failure_class', None)
+    
+    @last_failure_class.setter
+    def last_failure_class(self, value):
+        self.job_context.failure_class = value
+    
     def setup_ui(self):
         # Configure styles
         self.setup_styles()
@@ -562,6 +1622,7 @@ class LooperApp:
             if result.returncode == 0:
                 # Pin the absolute path to this exact binary
                 self.ffmpeg_exe = os.path.abspath(exe)
+                self.ffprobe_exe = self._resolve_ffprobe()
                 self.ffmpeg_available = True
                 # Probe HAP support only once here
                 self._ffmpeg_supports_hap()
@@ -571,8 +1632,10 @@ class LooperApp:
                 print('✅ FFmpeg is installed and working')
                 if result.stdout:
                     version_line = result.stdout.split('\n')[0]
+                    self.ffmpeg_version = version_line
                     print(f'   Version: {version_line}')
                 print(f'   Using: {self.ffmpeg_exe}')
+                print(f'   ffprobe: {self.ffprobe_exe or "not found (OpenCV probing)"}')
                 print(f'   HAP available: {self.ff_has_hap}')
                 return True
             else:
@@ -589,6 +1652,21 @@ class LooperApp:
         exe = self.ffmpeg_exe or 'ffmpeg'
         return [exe, *args]
 
+    def _ffprobe(self, *args):
+        """Build a subprocess arg list for ffprobe, preferring the one shipped with ffmpeg."""
+        exe = self.ffprobe_exe or which('ffprobe') or 'ffprobe'
+        return [exe, *args]
+
+    def _resolve_ffprobe(self):
+        """Find ffprobe alongside the pinned ffmpeg binary, falling back to PATH."""
+        if self.ffmpeg_exe:
+            name = 'ffprobe.exe' if os.name == 'nt' else 'ffprobe'
+            sibling = os.path.join(os.path.dirname(self.ffmpeg_exe), name)
+            if os.path.exists(sibling):
+                return sibling
+        found = which('ffprobe')
+        return os.path.abspath(found) if found else None
+
     def _ffmpeg_supports_hap(self):
         """Probe for HAP support in the current FFmpeg installation."""
         try:
@@ -697,6 +1775,7 @@ class LooperApp:
 
                 if resolved:
                     self.ffmpeg_exe = os.path.abspath(resolved)
+                    self.ffprobe_exe = self._resolve_ffprobe()
                     self._ffmpeg_supports_hap()
                     self.ffmpeg_hap_ready = self.ff_has_hap
                     print(f'✅ FFmpeg path pinned to: {self.ffmpeg_exe}')
@@ -924,6 +2003,7 @@ class LooperApp:
         
         # We'll create individual file frames dynamically
         self.file_frames = []
+        self.job_status_labels = []  # render status cell of each row, index-aligned with file_frames
         
         # No scrollbar needed for individual file frames
         
@@ -1118,7 +2198,7 @@ class LooperApp:
             
             for file_path in files:
                 print(f"Checking file: {file_path}")
-                if any(file_path.lower().endswith(ext.lower()) for ext in video_extensions):
+                if os.path.isdir(file_path) or any(file_path.lower().endswith(ext.lower()) for ext in video_extensions):
                     video_files.append(file_path)
                     print(f"Added video file: {file_path}")
                 else:
@@ -1164,23 +2244,19 @@ class LooperApp:
         if not file_paths:
             return
         
-        # Filter for video files
-        video_extensions = ['.mp4', '.mov', '.avi', '.mkv', '.MP4', '.MOV', '.AVI', '.MKV']
+        # Filter for video files; dropped folders are scanned recursively
         video_files = []
         
         for file_path in file_paths:
-            if any(file_path.lower().endswith(ext.lower()) for ext in video_extensions):
+            if os.path.isdir(file_path) or file_path.lower().endswith(VIDEO_EXTENSIONS):
                 video_files.append(file_path)
         
         if video_files:
             # Add to existing list instead of replacing
-            self.video_paths.extend(video_files)
-            self.analyze_all_videos()
-            self.update_file_display()
-            self.process_button.config(state=tk.NORMAL)
+            self.add_videos_to_queue(video_files, recursive=True)
             
             # Silent success - no popup messages
-            print(f"✓ Added {len(video_files)} video file(s) to queue")
+            print(f"✓ Queued {len(video_files)} dropped item(s) for analysis")
         else:
             print("⚠️ No valid video files found in dropped items")
     
@@ -1190,15 +2266,32 @@ class LooperApp:
         settings_section = tk.Frame(main_frame, bg=self.colors['bg_primary'])
         settings_section.pack(fill=tk.X, pady=(0, 20))
         
-        # Section header
+        # Section header, with the performance popup on the right
+        header_row = tk.Frame(settings_section, bg=self.colors['bg_primary'])
+        header_row.pack(fill=tk.X, pady=(0, 12))
         settings_header = tk.Label(
-            settings_section,
+            header_row,
             text="LOOP PARAMETERS",
             font=("Consolas", 14, "bold"),
             fg=self.colors['text_primary'],
             bg=self.colors['bg_primary']
         )
-        settings_header.pack(anchor='w', pady=(0, 12))
+        settings_header.pack(side=tk.LEFT)
+        tk.Button(
+            header_row,
+            text="PERFORMANCE ⚙️",
+            command=self.show_performance_settings,
+            font=("Consolas", 10, "bold"),
+            bg=self.colors['accent_secondary'],
+            fg=self.colors['bg_primary'],
+            activebackground=self.colors['accent_primary'],
+            activeforeground=self.colors['bg_primary'],
+            relief="flat",
+            bd=0,
+            padx=8,
+            pady=2,
+            cursor="hand2"
+        ).pack(side=tk.RIGHT)
         
         # Settings container
         settings_container = tk.Frame(settings_section, bg=self.colors['bg_secondary'], relief='solid', bd=1)
@@ -1288,6 +2381,9 @@ class LooperApp:
         
         self.format_var = tk.StringVar(value="HAP")
         self.quality_var = tk.IntVar(value=18)  # Default CRF value for MP4
+        self.hap_variant_var = tk.StringVar(value="Hap")  # key of HAP_VARIANTS
+        self.hap_compressor_var = tk.StringVar(value="snappy")
+        self.hap_playback_cores_var = tk.IntVar(value=0)  # 0 = this machine
         
         combo_container = tk.Frame(right_settings, bg=self.colors['bg_container'])
         combo_container.pack(side=tk.RIGHT)
@@ -1295,10 +2391,10 @@ class LooperApp:
         format_combo = ttk.Combobox(
             combo_container,
             textvariable=self.format_var,
-            values=["HAP", "MP4"],
+            values=list(OUTPUT_FORMAT_CHOICES),
             font=("Consolas", 11, "bold"),
             state="readonly",
-            width=6,
+            width=18,
             style='Futuristic.TCombobox'
         )
         format_combo.pack(side=tk.LEFT, padx=(0, 5))
@@ -1320,6 +2416,23 @@ class LooperApp:
             cursor="hand2"
         )
         
+        # Settings button for the HAP encoder profile (initially hidden)
+        self.hap_settings_button = tk.Button(
+            combo_container,
+            text="HAP ⚙️",
+            command=self.show_hap_settings,
+            font=("Consolas", 10, "bold"),
+            bg=self.colors['accent_secondary'],
+            fg=self.colors['bg_primary'],
+            activebackground=self.colors['accent_primary'],
+            activeforeground=self.colors['bg_primary'],
+            relief="flat",
+            bd=0,
+            padx=8,
+            pady=2,
+            cursor="hand2"
+        )
+        
         # Bind format change to show/hide settings button
         format_combo.bind('<<ComboboxSelected>>', self.on_format_change)
         
@@ -1351,6 +2464,13 @@ class LooperApp:
         )
         self.process_button.pack(pady=20)
         
+        # Batch controls, shown only while a batch is running
+        self.batch_controls = tk.Frame(action_section, bg=self.colors['bg_primary'])
+        self.pause_button = self.create_futuristic_button(self.batch_controls, "⏸ PAUSE", self.toggle_pause)
+        self.pause_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = self.create_futuristic_button(self.batch_controls, "✕ CANCEL ALL", self.cancel_batch)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        
         # Enhanced hover effect with color transitions
         def on_button_enter(e):
             if self.process_button['state'] != 'disabled':
@@ -1377,25 +2497,38 @@ class LooperApp:
         self.process_button.bind("<Enter>", on_button_enter)
         self.process_button.bind("<Leave>", on_button_leave)
     
+    def selected_formats(self):
+        """Output formats rendered for every job, e.g. ["HAP", "MP4"]"""
+        return OUTPUT_FORMAT_CHOICES.get(self.format_var.get(), ["HAP"])
+    
     def on_format_change(self, event=None):
         """Handle format selection change"""
-        if self.format_var.get() == "MP4":
-            self.settings_button.pack(side=tk.LEFT)
-            return
-        # HAP chosen → enforce
-        self.settings_button.pack_forget()
-        if not self.ensure_hap_or_prompt():
-            # user will install; keep selection on HAP so behavior is clear
-            pass
+        formats = self.selected_formats()
+        self.update_format_buttons(formats)
+        if "HAP" in formats:
+            # HAP chosen → enforce
+            if not self.ensure_hap_or_prompt():
+                # user will install; keep selection on HAP so behavior is clear
+                pass
     
     def check_initial_format(self):
         """Check initial format and show settings button if needed"""
-        if self.format_var.get() == "MP4":
-            self.settings_button.pack(side=tk.LEFT)
-        else:  # HAP default
-            self.settings_button.pack_forget()
+        if self.format_var.get() not in OUTPUT_FORMAT_CHOICES:
+            self.format_var.set("HAP")
+        formats = self.selected_formats()
+        self.update_format_buttons(formats)
+        if "HAP" in formats:
             self.ensure_hap_or_prompt()
     
+    def update_format_buttons(self, formats):
+        """Show the settings buttons of the selected formats (MP4 quality, HAP profile)"""
+        self.settings_button.pack_forget()
+        self.hap_settings_button.pack_forget()
+        if "HAP" in formats:
+            self.hap_settings_button.pack(side=tk.LEFT, padx=(0, 5))
+        if "MP4" in formats:
+            self.settings_button.pack(side=tk.LEFT)
+    
     def toggle_overlap_mode(self):
         """Toggle between seconds and frames mode"""
         if self.overlap_mode.get() == "seconds":
@@ -1530,25 +2663,294 @@ class LooperApp:
         )
         close_button.pack(pady=(15, 0))
     
-    def setup_progress_section(self, main_frame):
-        """Setup the progress section"""
-        # Progress section with futuristic design
-        progress_section = tk.Frame(main_frame, bg=self.colors['bg_primary'])
-        progress_section.pack(fill=tk.X, pady=(0, 35))
+    def show_hap_settings(self):
+        """Show HAP encoding popup: variant, compressor, chunking and a variant benchmark"""
+        hap_window = tk.Toplevel(self.root)
+        hap_window.title("HAP Encoding")
+        hap_window.geometry("380x300")
+        hap_window.configure(bg=self.colors['bg_primary'])
+        hap_window.resizable(False, False)
+        hap_window.transient(self.root)
+        hap_window.grab_set()
         
-        # Section header
-        progress_header = tk.Label(
-            progress_section,
-            text="◦ PROCESSING STATUS",
+        # Center the window
+        hap_window.update_idletasks()
+        x = (hap_window.winfo_screenwidth() // 2) - (hap_window.winfo_width() // 2)
+        y = (hap_window.winfo_screenheight() // 2) - (hap_window.winfo_height() // 2)
+        hap_window.geometry(f"+{x}+{y}")
+        
+        # Main container
+        main_container = tk.Frame(hap_window, bg=self.colors['bg_primary'])
+        main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        
+        # Title
+        tk.Label(
+            main_container,
+            text="HAP Encoding",
             font=("Consolas", 14, "bold"),
             fg=self.colors['accent_primary'],
             bg=self.colors['bg_primary']
-        )
-        progress_header.pack(anchor='w', pady=(0, 15))
-        
-        # Progress container
-        progress_container = tk.Frame(progress_section, bg=self.colors['bg_secondary'], relief='solid', bd=1)
-        progress_container.pack(fill=tk.X, padx=5)
+        ).pack(pady=(0, 15))
+        
+        options_container = tk.Frame(main_container, bg=self.colors['bg_secondary'], relief='solid', bd=1)
+        options_container.pack(fill=tk.X, pady=(0, 10))
+        
+        rows = [
+            ("VARIANT:", ttk.Combobox(options_container, textvariable=self.hap_variant_var, values=list(HAP_VARIANTS),
+                                      font=("Consolas", 10, "bold"), state="readonly", width=10,
+                                      style='Futuristic.TCombobox')),
+            ("COMPRESSOR:", ttk.Combobox(options_container, textvariable=self.hap_compressor_var, values=list(HAP_COMPRESSORS),
+                                         font=("Consolas", 10, "bold"), state="readonly", width=10,
+                                         style='Futuristic.TCombobox')),
+            ("PLAYBACK CORES:", tk.Spinbox(options_container, from_=0, to=HAP_MAX_CHUNKS, increment=1,
+                                           textvariable=self.hap_playback_cores_var, font=("Consolas", 10, "bold"),
+                                           bg=self.colors['bg_container'], fg=self.colors['accent_primary'],
+                                           relief="flat", width=5)),
+        ]
+        for row, (label, widget) in enumerate(rows):
+            tk.Label(
+                options_container,
+                text=label,
+                font=("Consolas", 10, "bold"),
+                fg=self.colors['accent_secondary'],
+                bg=self.colors['bg_secondary']
+            ).grid(row=row, column=0, sticky='w', padx=(15, 10), pady=6)
+            widget.grid(row=row, column=1, sticky='e', padx=(0, 15), pady=6)
+        
+        tk.Label(
+            main_container,
+            text="Playback cores 0 = this machine (sets -chunks)",
+            font=("Consolas", 8),
+            fg=self.colors['text_muted'],
+            bg=self.colors['bg_primary']
+        ).pack(anchor='w')
+        
+        buttons = tk.Frame(main_container, bg=self.colors['bg_primary'])
+        buttons.pack(pady=(15, 0))
+        for text, command in (("Benchmark", self.start_hap_benchmark), ("Apply", hap_window.destroy)):
+            tk.Button(
+                buttons,
+                text=text,
+                command=command,
+                font=("Consolas", 10, "bold"),
+                bg=self.colors['accent_primary'],
+                fg=self.colors['bg_primary'],
+                activebackground=self.colors['accent_secondary'],
+                activeforeground=self.colors['bg_primary'],
+                relief="flat",
+                padx=15,
+                pady=5,
+                cursor="hand2"
+            ).pack(side=tk.LEFT, padx=5)
+    
+    def start_hap_benchmark(self):
+        """Benchmark every HAP variant on the first queued video, in the background"""
+        if not self.video_infos:
+            self.render_status("⚠️ Add a video to the queue to benchmark HAP variants", 0)
+            return
+        if not self.ff_has_hap:
+            self.ensure_hap_or_prompt()
+            return
+        thread = threading.Thread(target=self.benchmark_hap_variants, args=(self.video_infos[0],))
+        thread.daemon = True
+        thread.start()
+    
+    def benchmark_hap_variants(self, video_info):
+        """Encode a short sample with each HAP variant; report encode time, size and decode throughput"""
+        input_path = self.normalize_path(video_info.path)
+        sample_frames = max(1, min(video_info.frame_count, int(HAP_BENCHMARK_SECONDS * video_info.fps)))
+        playback_threads = str(self.hap_chunk_count())
+        work_dir = tempfile.mkdtemp(prefix='looper_hap_bench_')
+        results = []
+        try:
+            for i, variant in enumerate(HAP_VARIANTS):
+                self.update_status(f"⏱️ Benchmarking {variant}...", i / len(HAP_VARIANTS) * 100)
+                sample_path = os.path.join(work_dir, f"{variant}.mov")
+                encode_cmd = self._ff(
+                    '-y', '-i', input_path, '-map', '0:v:0', '-frames:v', str(sample_frames),
+                    *self.hap_encoder_args(variant), sample_path
+                )
+                started = time.monotonic()
+                return_code, stderr_output = self.run_ffmpeg(encode_cmd, "", quiet=True)
+                encode_seconds = time.monotonic() - started
+                if return_code != 0:
+                    print(f"HAP benchmark encode failed for {variant}:", '\n'.join(stderr_output))
+                    results.append(f"{variant}: encode failed ({classify_ffmpeg_failure(stderr_output)})")
+                    continue
+                
+                # Playback side: decode as fast as possible with the playback machine's thread count
+                decode_cmd = self._ff('-threads', playback_threads, '-i', sample_path, '-f', 'null', '-')
+                started = time.monotonic()
+                return_code, stderr_output = self.run_ffmpeg(decode_cmd, "", quiet=True)
+                decode_seconds = max(time.monotonic() - started, 1e-6)
+                if return_code != 0:
+                    results.append(f"{variant}: decode failed")
+                    continue
+                
+                size_mb = os.path.getsize(sample_path) / (1024 * 1024)
+                results.append(
+                    f"{variant}: encode {encode_seconds:.1f}s, {size_mb:.1f} MB, "
+                    f"decode {sample_frames / decode_seconds:.0f} fps"
+                )
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        
+        report = '\n'.join(results)
+        print(f"HAP benchmark ({sample_frames} frames of {video_info.filename}):\n{report}")
+        self.update_status("✅ HAP benchmark complete", 100)
+        messagebox.showinfo(
+            "HAP Benchmark",
+            f"{sample_frames} frames of {video_info.filename}\n"
+            f"{self.hap_compressor_var.get()} compressor, {playback_threads} chunks\n\n{report}"
+        )
+    
+    def show_performance_settings(self):
+        """Show the performance popup: probing, render strategies, thread budget, render cache and scheduling"""
+        if self.is_processing:
+            self.render_status("⚠️ Performance settings can be changed between batches", 0)
+            return
+        perf_window = tk.Toplevel(self.root)
+        perf_window.title("Performance")
+        perf_window.geometry("400x550")
+        perf_window.configure(bg=self.colors['bg_primary'])
+        perf_window.resizable(False, False)
+        perf_window.transient(self.root)
+        perf_window.grab_set()
+        
+        # Center the window
+        perf_window.update_idletasks()
+        x = (perf_window.winfo_screenwidth() // 2) - (perf_window.winfo_width() // 2)
+        y = (perf_window.winfo_screenheight() // 2) - (perf_window.winfo_height() // 2)
+        perf_window.geometry(f"+{x}+{y}")
+        
+        # Main container
+        main_container = tk.Frame(perf_window, bg=self.colors['bg_primary'])
+        main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        
+        # Title
+        tk.Label(
+            main_container,
+            text="Performance",
+            font=("Consolas", 14, "bold"),
+            fg=self.colors['accent_primary'],
+            bg=self.colors['bg_primary']
+        ).pack(pady=(0, 15))
+        
+        options_container = tk.Frame(main_container, bg=self.colors['bg_secondary'], relief='solid', bd=1)
+        options_container.pack(fill=tk.X, pady=(0, 10))
+        
+        # Edited on copies; the attributes only change on Apply
+        values = {
+            'probe_mode': tk.StringVar(value=self.probe_mode),
+            'smart_render_enabled': tk.BooleanVar(value=self.smart_render_enabled),
+            'segment_workers': tk.IntVar(value=self.segment_workers),
+            'preflight_enabled': tk.BooleanVar(value=self.preflight_enabled),
+            'render_backend': tk.StringVar(value=self.render_backend),
+            'thread_cores': tk.IntVar(value=self.thread_cores),
+            'concurrent_jobs': tk.IntVar(value=self.concurrent_jobs),
+            'job_order': tk.StringVar(value=self.job_order),
+            'memory_admission': tk.BooleanVar(value=self.memory_admission),
+            'render_cache_enabled': tk.BooleanVar(value=self.render_cache_enabled),
+            'render_cache_max_gb': tk.DoubleVar(value=self.render_cache_max_gb),
+        }
+        
+        def combo(name, choices):
+            return ttk.Combobox(options_container, textvariable=values[name], values=list(choices),
+                                font=("Consolas", 10, "bold"), state="readonly", width=10,
+                                style='Futuristic.TCombobox')
+        
+        def spin(name, low, high, increment=1):
+            return tk.Spinbox(options_container, from_=low, to=high, increment=increment,
+                              textvariable=values[name], font=("Consolas", 10, "bold"),
+                              bg=self.colors['bg_container'], fg=self.colors['accent_primary'],
+                              relief="flat", width=6)
+        
+        def check(name):
+            return tk.Checkbutton(options_container, variable=values[name],
+                                  bg=self.colors['bg_secondary'], activebackground=self.colors['bg_secondary'],
+                                  selectcolor=self.colors['bg_container'], fg=self.colors['accent_primary'],
+                                  relief="flat", bd=0, highlightthickness=0)
+        
+        rows = [
+            ("PROBE MODE:", combo('probe_mode', PROBE_MODES)),
+            ("SMART RENDER:", check('smart_render_enabled')),
+            ("SEGMENT WORKERS:", spin('segment_workers', 0, 32)),
+            ("PREFLIGHT:", check('preflight_enabled')),
+            ("RENDER BACKEND:", combo('render_backend', RENDER_BACKENDS)),
+            ("THREAD CORES:", spin('thread_cores', 0, os.cpu_count() or 64)),
+            ("CONCURRENT JOBS:", spin('concurrent_jobs', 0, MAX_AUTO_CONCURRENT_JOBS * 2)),
+            ("JOB ORDER:", combo('job_order', JOB_ORDER_POLICIES)),
+            ("MEMORY ADMISSION:", check('memory_admission')),
+            ("RENDER CACHE:", check('render_cache_enabled')),
+            ("CACHE LIMIT (GB):", spin('render_cache_max_gb', 1, 1000, 5)),
+        ]
+        for row, (label, widget) in enumerate(rows):
+            tk.Label(
+                options_container,
+                text=label,
+                font=("Consolas", 10, "bold"),
+                fg=self.colors['accent_secondary'],
+                bg=self.colors['bg_secondary']
+            ).grid(row=row, column=0, sticky='w', padx=(15, 10), pady=4)
+            widget.grid(row=row, column=1, sticky='e', padx=(0, 15), pady=4)
+        
+        tk.Label(
+            main_container,
+            text="0 = auto for workers, cores and jobs; 1 segment worker = off",
+            font=("Consolas", 8),
+            fg=self.colors['text_muted'],
+            bg=self.colors['bg_primary']
+        ).pack(anchor='w')
+        
+        def apply():
+            try:
+                updated = {name: var.get() for name, var in values.items()}
+            except tk.TclError:
+                self.render_status("⚠️ Performance settings need whole numbers (0 = auto)", 0)
+                return
+            for name in ('segment_workers', 'thread_cores', 'concurrent_jobs'):
+                updated[name] = max(0, int(updated[name]))
+            updated['render_cache_max_gb'] = max(1.0, float(updated['render_cache_max_gb']))
+            for name, value in updated.items():
+                setattr(self, name, value)
+            self.open_render_cache()
+            self.save_settings()
+            perf_window.destroy()
+        
+        tk.Button(
+            main_container,
+            text="Apply",
+            command=apply,
+            font=("Consolas", 10, "bold"),
+            bg=self.colors['accent_primary'],
+            fg=self.colors['bg_primary'],
+            activebackground=self.colors['accent_secondary'],
+            activeforeground=self.colors['bg_primary'],
+            relief="flat",
+            padx=15,
+            pady=5,
+            cursor="hand2"
+        ).pack(pady=(15, 0))
+    
+    def setup_progress_section(self, main_frame):
+        """Setup the progress section"""
+        # Progress section with futuristic design
+        progress_section = tk.Frame(main_frame, bg=self.colors['bg_primary'])
+        progress_section.pack(fill=tk.X, pady=(0, 35))
+        
+        # Section header
+        progress_header = tk.Label(
+            progress_section,
+            text="◦ PROCESSING STATUS",
+            font=("Consolas", 14, "bold"),
+            fg=self.colors['accent_primary'],
+            bg=self.colors['bg_primary']
+        )
+        progress_header.pack(anchor='w', pady=(0, 15))
+        
+        # Progress container
+        progress_container = tk.Frame(progress_section, bg=self.colors['bg_secondary'], relief='solid', bd=1)
+        progress_container.pack(fill=tk.X, padx=5)
         
         # Inner container
         progress_inner = tk.Frame(progress_container, bg=self.colors['bg_secondary'])
@@ -1635,7 +3037,6 @@ class LooperApp:
             highlightthickness=0
         )
         self.recent_listbox.pack(fill=tk.BOTH, expand=True)
-        self.recent_listbox.bind('<Double-Button-1>', self.load_recent_file)
         
     def select_files(self):
         """Select one or multiple video files"""
@@ -1651,10 +3052,7 @@ class LooperApp:
         
         if file_paths:
             # Add to existing list instead of replacing
-            self.video_paths.extend(list(file_paths))
-            self.analyze_all_videos()
-            self.update_file_display()
-            self.process_button.config(state=tk.NORMAL)
+            self.add_videos_to_queue(list(file_paths))
     
     def select_single_file(self):
         """Select a single video file"""
@@ -1670,10 +3068,7 @@ class LooperApp:
         
         if file_path:
             # Add to existing list instead of replacing
-            self.video_paths.append(file_path)
-            self.analyze_all_videos()
-            self.update_file_display()
-            self.process_button.config(state=tk.NORMAL)
+            self.add_videos_to_queue([file_path])
     
     def select_multiple_files(self):
         """Select multiple video files"""
@@ -1689,77 +3084,393 @@ class LooperApp:
         
         if file_paths:
             # Add to existing list instead of replacing
-            self.video_paths.extend(list(file_paths))
-            self.analyze_all_videos()
-            self.update_file_display()
-            self.process_button.config(state=tk.NORMAL)
+            self.add_videos_to_queue(list(file_paths))
             # Recent files functionality removed
     
     def select_batch_folder(self):
-        """Select a folder and process all video files in it"""
+        """Select a folder and queue all video files in it"""
         folder_path = filedialog.askdirectory(
             title="Select Folder for Batch Processing"
         )
         
         if folder_path:
-            # Find all video files in the folder
-            video_extensions = ['.mp4', '.mov', '.avi', '.mkv', '.MP4', '.MOV', '.AVI', '.MKV']
-            video_files = []
-            
-            for file in os.listdir(folder_path):
-                if any(file.endswith(ext) for ext in video_extensions):
-                    video_files.append(os.path.join(folder_path, file))
+            # Only ask about subfolders when there are any
+            recursive = False
+            try:
+                with os.scandir(folder_path) as entries:
+                    has_subfolders = any(entry.is_dir() for entry in entries)
+            except OSError:
+                has_subfolders = False
+            if has_subfolders:
+                recursive = messagebox.askyesno(
+                    "Include Subfolders?",
+                    f"Also scan subfolders of:\n{folder_path}"
+                )
             
-            if video_files:
-                # Add to existing list instead of replacing
-                self.video_paths.extend(sorted(video_files))  # Sort for consistent order
-                self.analyze_all_videos()
-                self.update_file_display()
-                self.process_button.config(state=tk.NORMAL)
-                # Recent files functionality removed
-            else:
-                messagebox.showinfo("No Videos Found", f"No video files found in:\n{folder_path}")
+            # Add to existing list instead of replacing; rows appear as files are probed
+            self.add_videos_to_queue([folder_path], recursive=recursive)
+    
+    def add_videos_to_queue(self, sources, recursive=False):
+        """Queue files and folders for background analysis; rows stream in as probes finish"""
+        with self.scan_lock:
+            self.scan_requests.put((list(sources), recursive))
+            if self.scan_thread is None:
+                known = {self.path_key(path) for path in self.video_paths}
+                self.scan_thread = threading.Thread(target=self.scan_worker, args=(known,))
+                self.scan_thread.daemon = True
+                self.scan_thread.start()
+        
+        if not self.is_scanning:
+            self.is_scanning = True
+            self.scan_added = 0
+            self.scan_duplicates = []
+            self.analysis_failures = []
+            self.root.after(50, self.drain_scan_results)
     
-    def analyze_all_videos(self):
-        """Analyze all selected video files"""
-        self.video_infos = []
+    def iter_video_files(self, sources, recursive):
+        """Yield video file paths from files and folders lazily, using os.scandir"""
+        for source in sources:
+            if os.path.isdir(source):
+                yield from self.scan_folder(source, recursive)
+            elif source.lower().endswith(VIDEO_EXTENSIONS):
+                yield source
+    
+    def scan_folder(self, folder_path, recursive):
+        """Yield video files in a folder (sorted per directory), optionally descending"""
+        try:
+            with os.scandir(folder_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name.lower())
+        except OSError as e:
+            print(f"Could not scan {folder_path}: {e}")
+            return
         
-        for video_path in self.video_paths:
+        subfolders = []
+        for entry in entries:
             try:
-                cap = cv2.VideoCapture(video_path)
-                
-                if not cap.isOpened():
-                    # Skip files that can't be opened
+                if entry.is_dir():
+                    subfolders.append(entry.path)
+                elif entry.is_file() and entry.name.lower().endswith(VIDEO_EXTENSIONS):
+                    yield entry.path
+            except OSError:
+                continue
+        
+        if recursive:
+            for subfolder in subfolders:
+                yield from self.scan_folder(subfolder, recursive)
+    
+    def scan_worker(self, known):
+        """Producer thread: discover files, probe them on the pool, post results in queue order"""
+        in_flight = []  # (path, future) in discovery order
+        window = PROBE_MAX_WORKERS * 2
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=PROBE_MAX_WORKERS) as pool:
+            while True:
+                try:
+                    sources, recursive = self.scan_requests.get(timeout=0.1)
+                except queue.Empty:
+                    # Flush what's left; exit only if nothing new arrived meanwhile
+                    while in_flight:
+                        self.post_probe_result(*in_flight.pop(0))
+                    with self.scan_lock:
+                        if self.scan_requests.empty():
+                            self.scan_thread = None
+                            self.scan_results.put(('done', None, None))
+                            return
                     continue
                 
-                # Get video properties
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                duration = frame_count / fps if fps > 0 else 0
-                
-                # Get file size
-                file_size = os.path.getsize(video_path)
-                file_size_mb = file_size / (1024 * 1024)
-                
-                video_info = {
-                    'path': video_path,
-                    'fps': fps,
-                    'frame_count': frame_count,
-                    'width': width,
-                    'height': height,
-                    'duration': duration,
-                    'file_size_mb': file_size_mb,
-                    'filename': os.path.basename(video_path)
-                }
-                
-                self.video_infos.append(video_info)
-                cap.release()
-                
+                for path in self.iter_video_files(sources, recursive):
+                    key = self.path_key(path)
+                    if key in known:
+                        continue  # already queued or seen in this scan
+                    known.add(key)
+                    in_flight.append((path, pool.submit(self.probe_video_file, path)))
+                    
+                    # Post finished probes from the head so rows keep discovery order,
+                    # and block on the head once the look-ahead window is full
+                    while in_flight and (in_flight[0][1].done() or len(in_flight) >= window):
+                        self.post_probe_result(*in_flight.pop(0))
+    
+    def post_probe_result(self, path, future):
+        """Hand one finished probe to the Tk thread"""
+        try:
+            self.scan_results.put(('row', path, future.result()))
+        except Exception as e:
+            self.scan_results.put(('error', path, str(e)))
+    
+    def drain_scan_results(self):
+        """Tk-thread consumer: append streamed rows to the queue view"""
+        finished = False
+        queued_content = {info.fingerprint: info.filename for info in self.video_infos if info.fingerprint}
+        for _ in range(200):  # bound the work per tick so the UI stays responsive
+            try:
+                kind, path, payload = self.scan_results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'row':
+                if payload.fingerprint in queued_content:
+                    # Same clip dragged in twice, or a renamed copy
+                    self.scan_duplicates.append((path, queued_content[payload.fingerprint]))
+                    print(f"Skipped duplicate {path} (same content as {queued_content[payload.fingerprint]})")
+                    continue
+                if payload.fingerprint:
+                    queued_content[payload.fingerprint] = payload.filename
+                self.video_paths.append(path)
+                self.video_infos.append(payload)
+                self.append_file_row(len(self.video_infos) - 1, payload)
+                self.scan_added += 1
+                self.add_row_to_batch(len(self.video_infos) - 1)
+            elif kind == 'error':
+                self.analysis_failures.append((path, payload))
+            elif kind == 'done':
+                # A new producer may have started after this one finished
+                with self.scan_lock:
+                    finished = self.scan_thread is None
+                if finished:
+                    break
+        
+        if self.video_infos:
+            self.update_file_summary()
+            if not self.is_processing:
+                self.process_button.config(state=tk.NORMAL)
+        
+        if not finished:
+            self.render_status(f"🔍 Scanning... {self.scan_added} file(s) added", 0)
+            self.root.after(50, self.drain_scan_results)
+            return
+        
+        self.is_scanning = False
+        duplicates_note = f" ({len(self.scan_duplicates)} duplicate(s) skipped)" if self.scan_duplicates else ""
+        if self.analysis_failures:
+            self.report_analysis_failures()
+        elif self.scan_added:
+            self.render_status(f"◦ {self.scan_added} FILE(S) ADDED - READY ◦{duplicates_note}", 100)
+        elif self.scan_duplicates:
+            self.render_status(f"◦ No new video files{duplicates_note} ◦", 0)
+        else:
+            self.render_status("◦ No new video files found ◦", 0)
+        
+        if self.resume_outputs is not None:
+            if self.video_infos:
+                self.start_resumed_batch()
+            else:
+                self.resume_outputs = None
+                self.job_journal.finish_batch(self.batch_id)  # nothing left that can be rendered
+    
+    def path_key(self, path):
+        """Comparable identity for a file path (case/separator insensitive where the OS is)"""
+        return os.path.normcase(os.path.abspath(path))
+    
+    def probe_video_file(self, video_path):
+        """Read video properties for one file; raises if the file can't be analyzed"""
+        mode = self.probe_mode if self.probe_mode in PROBE_MODES else 'fast'
+        
+        if self.probe_cache:
+            cached = self.probe_cache.get(video_path)
+            # A cached result is good enough if it came from an engine at least as accurate
+            if cached and PROBE_ENGINE_RANK.get(cached.probe_engine, 0) >= PROBE_ENGINE_RANK[mode]:
+                if not cached.fingerprint:
+                    # Entry predates fingerprinting - fill it in once
+                    cached.fingerprint = compute_fingerprint(video_path)
+                    self.probe_cache.put(video_path, cached)
+                return cached
+        
+        video_info = None
+        if mode != 'opencv':
+            try:
+                video_info = self.probe_with_ffprobe(video_path, exact=(mode == 'exact'))
             except Exception as e:
-                print(f"Error analyzing {video_path}: {str(e)}")
+                print(f"ffprobe failed for {video_path}, falling back to OpenCV: {e}")
+        if video_info is None:
+            video_info = self.probe_with_opencv(video_path)
+        video_info.fingerprint = compute_fingerprint(video_path)
+        
+        if self.probe_cache:
+            self.probe_cache.put(video_path, video_info)
+        return video_info
+    
+    def probe_with_ffprobe(self, video_path, exact=False):
+        """Probe with ffprobe: container index/packet count (fast) or full decode (exact)"""
+        entries = 'stream=codec_name,pix_fmt,profile,level,width,height,r_frame_rate,avg_frame_rate,nb_frames,duration'
+        args = ['-v', 'error', '-select_streams', 'v:0']
+        if exact:
+            # Decode every frame - slow, but the only count that survives broken indexes
+            args.append('-count_frames')
+            entries += ',nb_read_frames'
+        args += ['-show_entries', entries + ':format=duration', '-of', 'json', video_path]
+        
+        data = self._run_ffprobe_json(args)
+        stream = (data.get('streams') or [None])[0]
+        if not stream:
+            raise Exception("No video stream found")
+        
+        frame_count = int(stream.get('nb_read_frames') or 0) if exact else int(stream.get('nb_frames') or 0)
+        if frame_count <= 0 and not exact:
+            # No frame count in the container header (MKV, some MOVs) - count packets, no decode
+            packet_args = ['-v', 'error', '-select_streams', 'v:0', '-count_packets',
+                           '-show_entries', 'stream=nb_read_packets', '-of', 'json', video_path]
+            packets = self._run_ffprobe_json(packet_args)
+            frame_count = int(((packets.get('streams') or [{}])[0]).get('nb_read_packets') or 0)
+        
+        real_fps = parse_rational(stream.get('r_frame_rate', ''))
+        avg_fps = parse_rational(stream.get('avg_frame_rate', ''))
+        fps = avg_fps or real_fps
+        is_vfr = bool(real_fps and avg_fps and abs(real_fps - avg_fps) / real_fps > VFR_TOLERANCE)
+        
+        stream_duration = float(stream.get('duration') or (data.get('format') or {}).get('duration') or 0)
+        if is_vfr and stream_duration > 0 and fps > 0:
+            # The render graph resamples to a constant fps, so count frames on that grid
+            frame_count = int(round(stream_duration * fps))
+        if fps <= 0 or frame_count <= 0:
+            raise Exception("ffprobe could not determine frame rate or frame count")
+        
+        file_size = os.path.getsize(video_path)
+        return VideoInfo(
+            video_path,
+            fps=fps,
+            frame_count=frame_count,
+            width=int(stream.get('width') or 0),
+            height=int(stream.get('height') or 0),
+            duration=frame_count / fps,
+            file_size_mb=file_size / (1024 * 1024),
+            probe_engine='exact' if exact else 'fast',
+            is_vfr=is_vfr,
+            codec_name=stream.get('codec_name'),
+            pix_fmt=stream.get('pix_fmt'),
+            profile=stream.get('profile'),
+            level=stream.get('level')
+        )
+    
+    def _run_ffprobe_json(self, args, stderr_lines=None):
+        """Run ffprobe with JSON output and return the parsed result.
+        
+        On a job thread the process is registered with the job controller, so keyframe
+        indexing and other per-job probes are cancelled and paused with the job.
+        Non-fatal messages (e.g. decode errors) are appended to stderr_lines if given.
+        """
+        process = subprocess.Popen(
+            self._ffprobe(*args),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+        job_index = getattr(self.job_context, 'job_index', None)
+        if job_index is not None:
+            self.job_controller.register(job_index, process)
+        try:
+            stdout, stderr = process.communicate()
+        finally:
+            if job_index is not None:
+                self.job_controller.unregister(job_index, process)
+        if process.returncode != 0:
+            raise Exception(stderr.strip()[:200] or f"ffprobe exited with {process.returncode}")
+        if stderr_lines is not None:
+            stderr_lines.extend(line for line in stderr.splitlines() if line.strip())
+        return json.loads(stdout or '{}')
+    
+    def get_keyframe_index(self, video_info):
+        """Sorted keyframe times (seconds from stream start) for an input, or None.
+        
+        Built from packet flags with ffprobe - no decoding - and cached in memory and
+        in the probe cache database under the content fingerprint.
+        """
+        key = video_info.fingerprint or self.path_key(video_info.path)
+        if key in self.keyframe_indexes:
+            return self.keyframe_indexes[key]
+        
+        keyframes = self.probe_cache.get_keyframes(key) if self.probe_cache else None
+        if keyframes is None:
+            try:
+                keyframes = self.extract_keyframe_index(video_info.path)
+            except Exception as e:
+                print(f"Keyframe index unavailable for {video_info.filename}: {e}")
+                return None
+            if self.probe_cache:
+                self.probe_cache.put_keyframes(key, keyframes)
+        
+        self.keyframe_indexes[key] = keyframes
+        return keyframes
+    
+    def extract_keyframe_index(self, video_path):
+        """Read packet flags with ffprobe and return sorted times of the keyframes a cut can start on.
+        
+        Open-GOP keyframes are left out: the packets that follow one in decode order include
+        leading pictures (pts before the keyframe) that reference the previous GOP, so a part
+        that starts there - a copied body, a seeked segment - would not decode cleanly.
+        """
+        data = self._run_ffprobe_json([
+            '-v', 'error', '-select_streams', 'v:0',
+            '-show_entries', 'packet=pts_time,dts_time,flags:format=start_time',
+            '-of', 'json', video_path
+        ])
+        # Times are made relative to the container start, matching how ffmpeg applies -ss
+        start_time = float((data.get('format') or {}).get('start_time') or 0)
+        keyframes = set()
+        candidate = None  # the current GOP's keyframe time while it still looks closed
+        for packet in data.get('packets') or []:
+            try:
+                stamp = float(packet.get('pts_time') or packet.get('dts_time'))
+            except (TypeError, ValueError):
                 continue
+            if 'K' in packet.get('flags', ''):
+                if candidate is not None:
+                    keyframes.add(round(candidate - start_time, 6))
+                candidate = stamp
+            elif candidate is not None and stamp < candidate - 1e-6:
+                candidate = None  # leading picture: open GOP, not a clean entry point
+        if candidate is not None:
+            keyframes.add(round(candidate - start_time, 6))
+        if not keyframes:
+            raise Exception("no keyframes found in packet flags")
+        return sorted(keyframes)
+    
+    def probe_with_opencv(self, video_path):
+        """Legacy probe through OpenCV; frame counts are container estimates"""
+        cap = cv2.VideoCapture(video_path)
+        try:
+            if not cap.isOpened():
+                raise Exception("Could not open video file")
+            
+            # Get video properties
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        finally:
+            cap.release()
+        
+        duration = frame_count / fps if fps > 0 else 0
+        
+        # Get file size
+        file_size = os.path.getsize(video_path)
+        file_size_mb = file_size / (1024 * 1024)
+        
+        return VideoInfo(
+            video_path,
+            fps=fps,
+            frame_count=frame_count,
+            width=width,
+            height=height,
+            duration=duration,
+            file_size_mb=file_size_mb,
+            probe_engine='opencv'
+        )
+    
+    def report_analysis_failures(self):
+        """Show the files that could not be analyzed in the status bar and a summary dialog"""
+        failures = self.analysis_failures
+        self.render_status(f"⚠️ {len(failures)} file(s) could not be analyzed", 100)
+        
+        for path, error in failures:
+            print(f"Error analyzing {path}: {error}")
+        
+        details = "\n".join(f"{os.path.basename(path)}: {error}" for path, error in failures[:20])
+        if len(failures) > 20:
+            details += f"\n... and {len(failures) - 20} more"
+        messagebox.showwarning(
+            "Analysis Failed",
+            f"{len(failures)} file(s) could not be analyzed and were not added:\n\n{details}"
+        )
     
     def update_file_display(self):
         """Update the file list display"""
@@ -1767,99 +3478,120 @@ class LooperApp:
         for frame in self.file_frames:
             frame.destroy()
         self.file_frames.clear()
+        self.job_status_labels.clear()
+        
+        # Add files as individual rows
+        for i, video_info in enumerate(self.video_infos):
+            self.append_file_row(i, video_info)
+        
+        self.update_file_summary()
+    
+    def append_file_row(self, i, video_info):
+        """Add one row for a queued file to the bottom of the file list"""
+        # Create a frame for this file row
+        file_frame = tk.Frame(self.files_container, bg=self.colors['bg_container'])
+        file_frame.pack(fill=tk.X, pady=1)
+        
+        # File info with better alignment
+        filename = video_info.filename  # Show full filename
+        resolution = f"{video_info.width}x{video_info.height}"
+        duration = f"{video_info.duration:.1f}s"
+        fps = f"{video_info.fps:.1f}fps"
+        if video_info.is_vfr:
+            fps += " VFR"  # resampled to constant fps when rendering
+        
+        # Filename (left)
+        filename_label = tk.Label(
+            file_frame,
+            text=filename,
+            font=("Consolas", 9, "bold"),
+            bg=self.colors['bg_container'],
+            fg=self.colors['accent_primary'],
+            anchor='w'
+        )
+        filename_label.grid(row=0, column=0, sticky="w", padx=(5, 0))
+        
+        # Resolution
+        res_label = tk.Label(
+            file_frame, 
+            text=resolution, 
+            font=("Consolas", 9),
+            bg=self.colors['bg_container'], 
+            fg=self.colors['text_primary']
+        )
+        res_label.grid(row=0, column=1, sticky="e", padx=(10, 5))
+        
+        # Duration
+        dur_label = tk.Label(
+            file_frame, 
+            text=duration, 
+            font=("Consolas", 9),
+            bg=self.colors['bg_container'], 
+            fg=self.colors['text_primary']
+        )
+        dur_label.grid(row=0, column=2, sticky="e", padx=(10, 5))
         
+        # FPS
+        fps_label = tk.Label(
+            file_frame, 
+            text=fps, 
+            font=("Consolas", 9),
+            bg=self.colors['bg_container'], 
+            fg=self.colors['text_primary']
+        )
+        fps_label.grid(row=0, column=3, sticky="e", padx=(10, 5))
+        
+        # Render status, filled in by the scheduler
+        status_label = tk.Label(
+            file_frame, 
+            text="", 
+            font=("Consolas", 9),
+            bg=self.colors['bg_container'], 
+            fg=self.colors['text_muted'],
+            anchor='w'
+        )
+        status_label.grid(row=0, column=4, sticky="w", padx=(10, 5))
+        self.job_status_labels.append(status_label)
+        
+        # Remove button (far right)
+        remove_btn = tk.Button(
+            file_frame, 
+            text="✕",
+            command=lambda idx=i: self.remove_file_by_index(idx),
+            font=("Consolas", 8, "bold"),
+            bg=self.colors['accent_secondary'], 
+            fg=self.colors['bg_primary'],
+            activebackground=self.colors['accent_primary'],
+            activeforeground=self.colors['bg_primary'],
+            relief="flat", 
+            cursor="hand2", 
+            width=2,
+            bd=0
+        )
+        remove_btn.grid(row=0, column=5, sticky="e", padx=(5, 5))
+        
+        # Add hover effects
+        remove_btn.bind('<Enter>', lambda e, btn=remove_btn: self.on_remove_button_hover(btn, True))
+        remove_btn.bind('<Leave>', lambda e, btn=remove_btn: self.on_remove_button_hover(btn, False))
+        
+        # Configure grid to push columns right
+        file_frame.grid_columnconfigure(0, weight=1)  # filename expands
+        file_frame.grid_columnconfigure(1, minsize=110)  # resolution
+        file_frame.grid_columnconfigure(2, minsize=75)   # length
+        file_frame.grid_columnconfigure(3, minsize=75)   # fps
+        file_frame.grid_columnconfigure(4, minsize=150)  # render status
+        file_frame.grid_columnconfigure(5, minsize=28)   # ✕ button
+        
+        self.file_frames.append(file_frame)
+    
+    def update_file_summary(self):
+        """Refresh the queue summary line"""
         if not self.video_infos:
             self.file_summary_label.config(text="No files in queue")
             return
         
-        # Add files as individual rows
-        total_size = 0
-        total_duration = 0
-        
-        for i, video_info in enumerate(self.video_infos):
-            # Create a frame for this file row
-            file_frame = tk.Frame(self.files_container, bg=self.colors['bg_container'])
-            file_frame.pack(fill=tk.X, pady=1)
-            
-            # File info with better alignment
-            filename = video_info['filename']  # Show full filename
-            resolution = f"{video_info['width']}x{video_info['height']}"
-            duration = f"{video_info['duration']:.1f}s"
-            fps = f"{video_info['fps']:.1f}fps"
-            
-            # Filename (left)
-            filename_label = tk.Label(
-                file_frame,
-                text=filename,
-                font=("Consolas", 9, "bold"),
-                bg=self.colors['bg_container'],
-                fg=self.colors['accent_primary'],
-                anchor='w'
-            )
-            filename_label.grid(row=0, column=0, sticky="w", padx=(5, 0))
-            
-            # Resolution
-            res_label = tk.Label(
-                file_frame, 
-                text=resolution, 
-                font=("Consolas", 9),
-                bg=self.colors['bg_container'], 
-                fg=self.colors['text_primary']
-            )
-            res_label.grid(row=0, column=1, sticky="e", padx=(10, 5))
-            
-            # Duration
-            dur_label = tk.Label(
-                file_frame, 
-                text=duration, 
-                font=("Consolas", 9),
-                bg=self.colors['bg_container'], 
-                fg=self.colors['text_primary']
-            )
-            dur_label.grid(row=0, column=2, sticky="e", padx=(10, 5))
-            
-            # FPS
-            fps_label = tk.Label(
-                file_frame, 
-                text=fps, 
-                font=("Consolas", 9),
-                bg=self.colors['bg_container'], 
-                fg=self.colors['text_primary']
-            )
-            fps_label.grid(row=0, column=3, sticky="e", padx=(10, 5))
-            
-            # Remove button (far right)
-            remove_btn = tk.Button(
-                file_frame, 
-                text="✕",
-                command=lambda idx=i: self.remove_file_by_index(idx),
-                font=("Consolas", 8, "bold"),
-                bg=self.colors['accent_secondary'], 
-                fg=self.colors['bg_primary'],
-                activebackground=self.colors['accent_primary'],
-                activeforeground=self.colors['bg_primary'],
-                relief="flat", 
-                cursor="hand2", 
-                width=2,
-                bd=0
-            )
-            remove_btn.grid(row=0, column=4, sticky="e", padx=(5, 5))
-            
-            # Add hover effects
-            remove_btn.bind('<Enter>', lambda e, btn=remove_btn: self.on_remove_button_hover(btn, True))
-            remove_btn.bind('<Leave>', lambda e, btn=remove_btn: self.on_remove_button_hover(btn, False))
-            
-            # Configure grid to push columns right
-            file_frame.grid_columnconfigure(0, weight=1)  # filename expands
-            file_frame.grid_columnconfigure(1, minsize=110)  # resolution
-            file_frame.grid_columnconfigure(2, minsize=75)   # length
-            file_frame.grid_columnconfigure(3, minsize=75)   # fps
-            file_frame.grid_columnconfigure(4, minsize=28)   # ✕ button
-            
-            self.file_frames.append(file_frame)
-            
-            total_size += video_info['file_size_mb']
-            total_duration += video_info['duration']
+        total_size = sum(info.file_size_mb for info in self.video_infos)
+        total_duration = sum(info.duration for info in self.video_infos)
         
         # Update summary
         file_count = len(self.video_infos)
@@ -1870,33 +3602,8 @@ class LooperApp:
     
     def analyze_video(self):
         try:
-            cap = cv2.VideoCapture(self.video_path)
-            
-            if not cap.isOpened():
-                raise Exception("Could not open video file")
-            
-            # Get video properties
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            duration = frame_count / fps if fps > 0 else 0
-            
-            # Get file size
-            file_size = os.path.getsize(self.video_path)
-            file_size_mb = file_size / (1024 * 1024)
-            
-            self.video_info = {
-                'fps': fps,
-                'frame_count': frame_count,
-                'width': width,
-                'height': height,
-                'duration': duration,
-                'file_size_mb': file_size_mb,
-                'filename': os.path.basename(self.video_path)
-            }
-            
-            cap.release()
+            # Served from the probe cache when the file is unchanged
+            self.video_info = self.probe_video_file(self.video_path)
             
         except Exception as e:
             messagebox.showerror("Error", f"Could not analyze video: {str(e)}")
@@ -1905,12 +3612,12 @@ class LooperApp:
         if not self.video_info:
             return
             
-        info_text = f"""File: {self.video_info['filename']}
-Duration: {self.video_info['duration']:.2f} seconds
-Resolution: {self.video_info['width']}x{self.video_info['height']}
-FPS: {self.video_info['fps']:.2f}
-Frames: {self.video_info['frame_count']}
-Size: {self.video_info['file_size_mb']:.1f} MB"""
+        info_text = f"""File: {self.video_info.filename}
+Duration: {self.video_info.duration:.2f} seconds
+Resolution: {self.video_info.width}x{self.video_info.height}
+FPS: {self.video_info.fps:.2f}
+Frames: {self.video_info.frame_count}
+Size: {self.video_info.file_size_mb:.1f} MB"""
         
         self.file_info_text.config(state=tk.NORMAL)
         self.file_info_text.delete(1.0, tk.END)
@@ -1919,9 +3626,9 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
     
     def process_videos(self):
         """Process all selected videos"""
-        if not self.video_paths or self.is_processing:
-            return
-        if self.format_var.get() == "HAP" and not self.ensure_hap_or_prompt():
+        if not self.video_infos or self.is_processing:
+            return  # rows still being probed join the batch once it runs
+        if "HAP" in self.selected_formats() and not self.ensure_hap_or_prompt():
             return
         if not self.ffmpeg_available:
             self.show_ffmpeg_installation_prompt()
@@ -1935,55 +3642,130 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
         if not output_dir:
             return
         
-        # Generate output paths for all files with normalized paths
-        self.output_paths = []
-        for video_info in self.video_infos:
-            base_name = os.path.splitext(video_info['filename'])[0]
-            extension = f".{self.format_var.get().lower()}"
-            if self.format_var.get() == "HAP":
-                extension = ".mov"  # HAP uses .mov extension
-            
-            output_path = os.path.join(output_dir, f"{base_name}_LOOPER{extension}")
-            # Normalize path separators
-            output_path = self.normalize_path(output_path)
-            self.output_paths.append(output_path)
+        # Generate output paths for all files with normalized paths: {format: path} per job
+        formats = self.selected_formats()
+        output_paths = [self.job_output_paths(video_info, output_dir, formats) for video_info in self.video_infos]
+        self.start_batch(output_paths, target=(output_dir, formats))
+    
+    def job_output_paths(self, video_info, output_dir, formats):
+        """{format: normalized output path} for one queued input"""
+        base_name = os.path.splitext(video_info.filename)[0]
+        return {
+            fmt: self.normalize_path(os.path.join(output_dir, f"{base_name}{OUTPUT_SUFFIXES[fmt]}"))
+            for fmt in formats
+        }
+    
+    def start_batch(self, output_paths, batch_id=None, journal_paths=None, target=None):
+        """Journal the batch (unless resuming batch_id) and start the scheduler thread.
+        
+        With target=(output_dir, formats), rows probed while the batch runs join it.
+        """
+        self.output_paths = output_paths
+        self.journal_paths = journal_paths or list(self.video_paths)  # journal key of each queued job
+        if batch_id is None and self.job_journal is not None:
+            batch_id = self.job_journal.start_batch(
+                self.current_settings(), list(zip(self.journal_paths, output_paths))
+            )
+        self.batch_id = batch_id
+        with self.batch_lock:
+            self.batch_target = target
+            self.batch_additions = queue.Queue()
         
         self.current_processing_index = 0
         self.is_processing = True
         self.process_button.config(state=tk.DISABLED)
+        self.pause_button.config(text="⏸ PAUSE")
+        self.batch_controls.pack(pady=(0, 10))
         
         # Start processing in separate thread
         thread = threading.Thread(target=self.process_videos_thread)
         thread.daemon = True
         thread.start()
     
+    def add_row_to_batch(self, index):
+        """Hand a freshly probed row to the running batch, if it still accepts rows (Tk thread)"""
+        with self.batch_lock:
+            if self.batch_target is None or index != len(self.output_paths):
+                return
+            output_dir, formats = self.batch_target
+            outputs = self.job_output_paths(self.video_infos[index], output_dir, formats)
+            self.output_paths.append(outputs)
+            self.journal_paths.append(self.video_paths[index])
+            if self.job_journal is not None and self.batch_id is not None:
+                self.job_journal.add_jobs(self.batch_id, [(self.video_paths[index], outputs)])
+            self.batch_additions.put(index)
+        self.set_job_status(index, "⏳ queued", self.colors['text_muted'])
+    
+    def close_batch(self):
+        """Stop accepting rows once the scan is over; False while more rows may still arrive"""
+        with self.batch_lock:
+            scan_over = not self.is_scanning or self.job_controller.batch_cancelled
+            if self.batch_target is not None and (not scan_over or not self.batch_additions.empty()):
+                return False
+            self.batch_target = None
+            return True
+    
     def process_videos_thread(self):
         """Process all videos in batch"""
         try:
-            total_files = len(self.video_infos)
             successful_files = []
             failed_files = []
+            wasted_seconds = 0.0
+            results = {}
             
-            for i, video_info in enumerate(self.video_infos):
-                self.current_processing_index = i
-                
-                # Update status for current file
-                current_file = video_info['filename']
-                file_progress = (i / total_files) * 100
-                self.update_status(f"📁 Processing {i+1}/{total_files}: {current_file}", 
-                                 file_progress)
-                
-                # Process this video
-                success = self.process_single_video(
-                    video_info, 
-                    self.output_paths[i], 
-                    self.format_var.get()
-                )
+            workers = self.job_concurrency()
+            self.render_concurrency = workers
+            self.job_controller.reset()
+            print(f"Scheduler: {len(self.output_paths)} jobs on {workers} slots")
+            for i in range(len(self.output_paths)):
+                self.set_job_status(i, "⏳ queued", self.colors['text_muted'])
+            
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(self.run_job, i): i for i in self.job_schedule()}
+                pending = set(futures)
+                while True:
+                    # Rows probed after the batch started join the running scheduler
+                    while not self.batch_additions.empty():
+                        i = self.batch_additions.get_nowait()
+                        future = pool.submit(self.run_job, i)
+                        futures[future] = i
+                        pending.add(future)
+                    if not pending:
+                        if self.close_batch():
+                            break
+                        time.sleep(0.2)  # the scan is still producing rows
+                        continue
+                    
+                    done, pending = concurrent.futures.wait(
+                        pending, timeout=0.2, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        i = futures[future]
+                        self.current_processing_index = i
+                        try:
+                            results[i] = future.result()
+                        except Exception as e:
+                            print(f"Job {self.video_infos[i].filename} crashed: {e}")
+                            results[i] = []
+                            self.set_job_status(i, "✗ failed", self.colors['error'])
+                        
+                        # Update batch status
+                        total_files = len(self.output_paths)
+                        cache_status = f" | {self.render_cache.status_text()}" if self.render_cache is not None else ""
+                        self.update_status(f"📁 Finished {len(results)}/{total_files}: {self.video_infos[i].filename}{cache_status}",
+                                         len(results) / total_files * 100)
+            
+            for i in sorted(results):
+                video_info = self.video_infos[i]
+                jobs = results[i]
+                current_file = video_info.filename
+                wasted_seconds += sum(job.wasted_seconds for job in jobs)
                 
-                if success:
+                if jobs and all(job.succeeded for job in jobs):
                     successful_files.append(current_file)
                 else:
-                    failed_files.append(current_file)
+                    reasons = sorted({job.failure_class or 'unknown' for job in jobs if not job.succeeded}) or ['crashed']
+                    failed_files.append(f"{current_file} ({', '.join(reasons)})")
             
             # Show completion summary
             self.update_status("🎉 BATCH PROCESSING COMPLETE!", 100)
@@ -1993,18 +3775,424 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
             if failed_files:
                 summary_message += f"✗ Failed to process: {len(failed_files)} files\n"
                 summary_message += f"\nFailed files:\n" + "\n".join(failed_files)
+            if wasted_seconds >= 1:
+                summary_message += f"\n\nTime spent on failed attempts: {wasted_seconds:.0f}s"
+            if self.render_cache is not None:
+                summary_message += f"\n{self.render_cache.status_text()}"
             
+            if self.job_journal is not None and self.batch_id is not None:
+                self.job_journal.finish_batch(self.batch_id)
             messagebox.showinfo("Batch Complete", summary_message)
             
         except Exception as e:
             self.update_status(f"❌ Batch processing error: {str(e)}", 0)
             messagebox.showerror("Error", f"Batch processing failed: {str(e)}")
         finally:
+            with self.batch_lock:
+                self.batch_target = None
+            self.render_concurrency = 1
+            self.job_controller.reset()  # a CANCEL ALL must not outlive its batch
             self.is_processing = False
             self.process_button.config(state=tk.NORMAL)
+            self.root.after(0, self.batch_controls.pack_forget)
+    
+    def cancel_job(self, index):
+        """Cancel one queued or running job; its ffmpeg children are terminated at once"""
+        if 0 <= index < len(self.video_infos):
+            print(f"Cancelling job {index}: {self.video_infos[index].filename}")
+            self.job_controller.cancel(index)
+            self.set_job_status(index, "⊘ cancelling", self.colors['text_muted'])
+    
+    def cancel_batch(self):
+        """Cancel every queued and running job"""
+        if not self.is_processing:
+            return
+        self.job_controller.cancel()
+        self.job_controller.resume()  # release jobs held by a pause so they can exit
+        self.render_status("⊘ Cancelling batch...", self.progress_var.get())
+    
+    def toggle_pause(self):
+        """Pause (suspend every ffmpeg child and hold queued jobs) or resume the batch"""
+        if not self.is_processing:
+            return
+        if self.job_controller.paused:
+            self.job_controller.resume()
+            self.pause_button.config(text="⏸ PAUSE")
+            self.render_status("▶ Batch resumed", self.progress_var.get())
+        else:
+            self.job_controller.pause()
+            self.pause_button.config(text="▶ RESUME")
+            self.render_status("⏸ Batch paused", self.progress_var.get())
+    
+    def job_concurrency(self):
+        """Jobs rendered at once: the 'concurrent_jobs' setting, or derived from cores and resolution"""
+        if self.concurrent_jobs > 0:
+            return self.concurrent_jobs
+        cores = self.thread_cores or os.cpu_count() or 1
+        # Size the slots for the largest frame in the batch so big jobs still get enough cores
+        largest = max((info.width * info.height for info in self.video_infos), default=1920 * 1080)
+        cores_per_job = max(1, round(JOB_CORES_PER_1080P * largest / (1920 * 1080)))
+        # While the scan runs more rows will join, so don't cap by the rows probed so far
+        queued = MAX_AUTO_CONCURRENT_JOBS if self.is_scanning else len(self.video_infos)
+        return max(1, min(MAX_AUTO_CONCURRENT_JOBS, cores // cores_per_job, queued))
+    
+    def job_schedule(self):
+        """Queue indexes in the order the scheduler should start them (see JOB_ORDER_POLICIES)"""
+        order = list(range(len(self.video_infos)))
+        if self.job_order == 'queue' or self.cost_model is None:
+            return order
+        estimates = [self.cost_model.estimate(info, list(outputs))
+                     for info, outputs in zip(self.video_infos, self.output_paths)]
+        order.sort(key=lambda i: estimates[i], reverse=self.job_order == 'longest')
+        print("Job order (" + self.job_order + "): " +
+              ", ".join(f"{self.video_infos[i].filename} ~{estimates[i]:.0f}" for i in order))
+        return order
+    
+    def job_memory_estimate(self, video_info, outputs):
+        """Estimated peak memory of one job for the render path it will most likely take"""
+        overlap_frames = self.overlap_frames_for(video_info)
+        trim_start = self.loop_timing(overlap_frames, video_info.frame_count, video_info.fps)[2]
+        if self.render_backend == 'pipe':
+            # Python holds single frames; the second decoder is the extra cost
+            graph_frames = GRAPH_QUEUE_FRAMES + DECODER_BUFFERED_FRAMES
+        elif video_info.is_vfr or trim_start < TAIL_SEEK_MIN_SECONDS:
+            # Without tail-seek the overlay branch shares one decoder with the base, so the
+            # graph queues frames until the overlay reaches the tail - up to the whole clip
+            graph_frames = video_info.frame_count
+        else:
+            graph_frames = overlap_frames + GRAPH_QUEUE_FRAMES
+        pipelines = 1
+        if not video_info.is_vfr and video_info.duration >= SEGMENT_RENDER_MIN_SECONDS:
+            pipelines = max(1, self.segment_worker_count())
+        return estimate_job_memory(video_info, list(outputs), graph_frames, pipelines)
+    
+    def admit_job(self, index, video_info, outputs):
+        """Block until the memory gate admits this job, or it is cancelled"""
+        need = self.job_memory_estimate(video_info, outputs)
+        if self.memory_gate.acquire(index, need, timeout=0):
+            return
+        print(f"Holding {video_info.filename} back: needs ~{need / 2**30:.1f} GB")
+        self.set_job_status(index, "⏳ waiting for memory", self.colors['text_muted'])
+        while not self.memory_gate.acquire(index, need, timeout=MEMORY_POLL_SECONDS):
+            if self.job_controller.is_cancelled(index):
+                return
+    
+    def run_job(self, index):
+        """Render queue entry index on a scheduler thread; returns its RenderJob records"""
+        video_info = self.video_infos[index]
+        outputs = self.output_paths[index]
+        self.job_controller.wait_while_paused()
+        if self.memory_admission and not self.job_controller.is_cancelled(index):
+            self.admit_job(index, video_info, outputs)
+        if self.job_controller.is_cancelled(index):
+            self.memory_gate.release(index)
+            self.set_job_status(index, "⊘ cancelled", self.colors['text_muted'])
+            self.journal_job(index, 'cancelled')
+            job = RenderJob(video_info, outputs)
+            job.failure_class = 'cancelled'
+            return [job]
+        
+        self.journal_job(index, 'running')
+        self.job_context.job_index = index  # ffmpeg children register under this job
+        if self.render_concurrency > 1:
+            self.job_context.row = index  # route this thread's status updates to the queue row
+        try:
+            self.set_job_status(index, "▶ rendering", self.colors['accent_primary'])
+            started = time.monotonic()
+            jobs = self.process_video_outputs(video_info, outputs)
+            elapsed = time.monotonic() - started
+        finally:
+            self.memory_gate.release(index)
+            self.job_context.row = None
+            self.job_context.job_index = None
+        
+        if self.job_controller.is_cancelled(index) and not all(job.succeeded for job in jobs):
+            # The killed render's partial files are already gone; outputs finished before
+            # the cancel were committed whole and are kept
+            for job in jobs:
+                if not job.succeeded:
+                    job.failure_class = 'cancelled'
+            self.set_job_status(index, "⊘ cancelled", self.colors['text_muted'])
+            self.journal_job(index, 'cancelled')
+        elif all(job.succeeded for job in jobs):
+            cached = all(job.strategy == 'cache' for job in jobs)
+            if self.cost_model is not None and not any(job.strategy == 'cache' for job in jobs):
+                # Concurrent jobs share the CPU, so scale wall time back to a solo render
+                self.cost_model.observe(video_info, list(outputs), elapsed / self.render_concurrency)
+            self.set_job_status(index, "✓ cached" if cached else "✓ done", self.colors['text_primary'])
+            self.journal_job(index, 'done')
+        else:
+            self.set_job_status(index, "✗ failed", self.colors['error'])
+            self.journal_job(index, 'failed')
+        return jobs
+    
+    def journal_job(self, index, state):
+        """Record a job state transition in the crash-safe journal"""
+        if self.job_journal is not None and self.batch_id is not None:
+            self.job_journal.set_state(self.batch_id, self.journal_paths[index], state)
+    
+    def offer_batch_resume(self):
+        """Ask whether to resume the unfinished jobs of an interrupted batch"""
+        if self.job_journal is None or self.is_processing:
+            return
+        interrupted = self.job_journal.interrupted_batch()
+        if interrupted is None:
+            return
+        batch_id, settings, unfinished, total = interrupted
+        if not messagebox.askyesno(
+            "Resume Batch",
+            f"A batch was interrupted with {len(unfinished)} of {total} files unfinished.\n\n"
+            "Resume rendering the unfinished files?"
+        ):
+            self.job_journal.finish_batch(batch_id)  # abandoned
+            return
+        
+        # Re-queue only the unfinished inputs, with the settings the batch started with
+        self.apply_settings(settings)
+        self.check_initial_format()
+        self.batch_id = batch_id
+        self.resume_outputs = {self.path_key(path): (path, outputs) for path, outputs in unfinished}
+        for path, _ in unfinished:
+            if not os.path.exists(path):
+                print(f"Interrupted job input is gone: {path}")
+                self.job_journal.set_state(batch_id, path, 'failed')
+        self.add_videos_to_queue([path for path, _ in unfinished if os.path.exists(path)])
+    
+    def start_resumed_batch(self):
+        """Called when the re-queued inputs of an interrupted batch have been probed"""
+        resume_outputs, self.resume_outputs = self.resume_outputs, None
+        if not self.ffmpeg_available:
+            self.show_ffmpeg_installation_prompt()
+            return  # the journal still holds the batch; it will be offered again
+        
+        journal_paths, output_paths = [], []
+        for video_info in self.video_infos:
+            entry = resume_outputs.pop(self.path_key(video_info.path), None)
+            if entry is None:
+                # Something else was queued meanwhile - resume needs the queue to match the journal
+                self.render_status("⚠️ Queue changed - interrupted batch not resumed", 0)
+                return
+            journal_paths.append(entry[0])
+            output_paths.append(entry[1])
+        for path, _ in resume_outputs.values():
+            print(f"Interrupted job could not be re-queued: {path}")
+            self.job_journal.set_state(self.batch_id, path, 'failed')
+        
+        self.render_status(f"▶ Resuming interrupted batch: {len(output_paths)} file(s)", 0)
+        self.start_batch(output_paths, batch_id=self.batch_id, journal_paths=journal_paths)
+    
+    def set_job_status(self, index, text, color=None):
+        """Update the status cell of one queue row (any thread)"""
+        def apply():
+            if 0 <= index < len(self.job_status_labels):
+                self.job_status_labels[index].config(text=text, **({'fg': color} if color else {}))
+        self.root.after(0, apply)
+    
+    def process_video_outputs(self, video_info, outputs):
+        """Render every selected format of one job, reusing cached renders where possible.
+        
+        Returns the RenderJob records (cache hits, then one for a shared pass or one per format).
+        """
+        outputs = dict(outputs)
+        overlap_frames = self.overlap_frames_for(video_info)
+        cache_keys = {fmt: self.render_cache_key(video_info, overlap_frames, fmt) for fmt in outputs}
+        
+        # Everything is written to partial files first; a stale output (which may be a hard
+        # link into the cache) is only ever replaced, never truncated
+        partials = {fmt: partial_output_path(self.normalize_path(path)) for fmt, path in outputs.items()}
+        jobs = []
+        try:
+            for output_format, output_path in list(outputs.items()):
+                cache_key = cache_keys[output_format]
+                if cache_key and self.render_cache.fetch(cache_key, partials[output_format]):
+                    print(f"💾 Render cache hit: {output_path}")
+                    job = RenderJob(video_info, {output_format: output_path})
+                    job.strategy = 'cache'
+                    jobs.append(job)
+                    del outputs[output_format]
+            if outputs:
+                rendered = self.render_outputs(
+                    video_info, {fmt: partials[fmt] for fmt in outputs}, overlap_frames
+                )
+                for job in rendered:
+                    job.outputs = {fmt: outputs[fmt] for fmt in job.outputs}
+                jobs += rendered
+            
+            for job in jobs:
+                if job.succeeded:
+                    self.commit_job_outputs(job, partials)
+        finally:
+            for partial_path in partials.values():
+                try:
+                    os.remove(partial_path)
+                except OSError:
+                    pass  # committed, or never written
+        
+        for job in jobs:
+            if job.strategy not in CACHEABLE_STRATEGIES:
+                continue
+            for output_format, output_path in job.outputs.items():
+                if cache_keys[output_format]:
+                    self.render_cache.store(cache_keys[output_format], self.normalize_path(output_path))
+        return jobs
+    
+    def commit_job_outputs(self, job, partials):
+        """Move the partial files of a successful job to their final paths"""
+        for output_format, output_path in job.outputs.items():
+            try:
+                commit_output(partials[output_format], self.normalize_path(output_path))
+            except OSError as e:
+                print(f"Could not finalise {output_path}: {e}")
+                job.strategy = None
+                job.failure_class = 'disk_full' if e.errno == errno.ENOSPC else 'permission'
+                return
+    
+    def render_outputs(self, video_info, outputs, overlap_frames):
+        """Render one input to every format in outputs, sharing a single decode where possible"""
+        if len(outputs) == 1:
+            (output_format, output_path), = outputs.items()
+            return [self.process_single_video(video_info, output_path, output_format)]
+        
+        if "HAP" not in outputs or self.ff_has_hap:
+            job = RenderJob(video_info, outputs)
+            input_path = self.normalize_path(video_info.path)
+            skipped = self.run_preflight(job, input_path, overlap_frames)
+            self.run_attempts(job, [
+                ('multi', lambda: self.try_multi_output_for_file(input_path, outputs, overlap_frames, video_info)),
+            ], skipped)
+            if job.succeeded or job.failure_class in FATAL_FAILURES:
+                return [job]
+        
+        # One pass failed (or cannot run) - render each format through its own fallback chain
+        return [self.process_single_video(video_info, path, fmt) for fmt, path in outputs.items()]
+    
+    def render_cache_key(self, video_info, overlap_frames, output_format):
+        """Render cache key for one output, or None when caching is off or the input has no fingerprint"""
+        if self.render_cache is None or not video_info.fingerprint:
+            return None
+        # Encoder settings minus the thread budget, which changes speed but not the output
+        encoder = self.encoder_args(output_format)
+        encoder = [arg for i, arg in enumerate(encoder)
+                   if arg != '-threads' and (i == 0 or encoder[i - 1] != '-threads')]
+        return RenderCache.make_key(
+            fingerprint=video_info.fingerprint,
+            overlap_frames=overlap_frames,
+            # Probe results set the trim point and fade timing, and differ between probe engines
+            frame_count=video_info.frame_count,
+            fps=video_info.fps,
+            is_vfr=bool(video_info.is_vfr),
+            probe_engine=video_info.probe_engine,
+            output_format=output_format,
+            encoder=encoder,
+            engine=RENDER_ENGINE_VERSION,
+            ffmpeg=self.ffmpeg_version,
+        )
+    
+    def overlap_frames_for(self, video_info):
+        """Crossfade length in frames for one input, from the seconds/frames setting"""
+        overlap_time = self.overlap_var.get()
+        if self.overlap_mode.get() == "seconds":
+            return int(overlap_time * video_info.fps)
+        # User input is already in frames
+        return int(overlap_time)
+    
+    def run_attempts(self, job, attempts, skipped=None):
+        """Run (name, callable) render attempts in order until one succeeds.
+        
+        Each failure is classified from ffmpeg's stderr; FAILURE_SKIPS then drops the
+        remaining attempts that would fail the same way, and the time spent on failed
+        attempts is charged to job.wasted_seconds. skipped seeds the dropped set
+        (e.g. from run_preflight).
+        """
+        skipped = set(skipped or ())
+        job_index = getattr(self.job_context, 'job_index', None)
+        for name, attempt in attempts:
+            if self.job_controller.is_cancelled(job_index):
+                job.failure_class = 'cancelled'
+                return False
+            if name in skipped:
+                print(f"Skipping {name} render for {job.video_info.filename}: {job.failure_class}")
+                continue
+            
+            self.last_failure_class = None
+            started = time.monotonic()
+            try:
+                success = attempt()
+            except Exception as e:
+                print(f"{name} render raised for {job.video_info.filename}: {e}")
+                success = False
+            elapsed = time.monotonic() - started
+            
+            if success:
+                job.strategy = name
+                job.failure_class = None
+                return True
+            
+            failure = 'cancelled' if self.job_controller.is_cancelled(job_index) else self.last_failure_class or 'unknown'
+            job.record_failure(name, failure, elapsed)
+            print(f"{name} render failed ({failure}) after {elapsed:.1f}s")
+            skipped |= FAILURE_SKIPS.get(failure, set())
+        return False
+    
+    def preflight_render(self, input_path, overlap_frames, video_info, output_format):
+        """Run the loop graph and encoder on the crossfade and a few frames past it into the null muxer.
+        
+        Only cheap with tail-seek: without it the overlay branch decodes up to the trim
+        point before frame 0 comes out, so the check is skipped and None returned.
+        """
+        fps = video_info.fps
+        _, _, _, output_duration, _ = self.loop_timing(overlap_frames, video_info.frame_count, fps)
+        output_frames = int(round(output_duration * fps))
+        
+        input_args, filter_complex, tail_offset_frames = self.loop_filter_args(
+            input_path, overlap_frames, video_info, pix_fmt=self.graph_pix_fmt([output_format])
+        )
+        if not tail_offset_frames:
+            return None
+        head_cmd = self._ff(
+            '-y', *input_args,
+            '-filter_complex', self.scaled_graph(filter_complex, output_format),
+            '-map', '[outv]',
+            '-frames:v', str(min(output_frames, overlap_frames + PREFLIGHT_EXTRA_FRAMES)),
+            *self.encoder_args(output_format),
+            '-f', 'null', '-'
+        )
+        return_code, stderr_output = self.run_ffmpeg(head_cmd, "", quiet=True)
+        if return_code != 0:
+            print("Preflight stderr:", '\n'.join(stderr_output))
+            return False
+        return True
+    
+    def run_preflight(self, job, input_path, overlap_frames):
+        """Preflight every output of a job; returns the attempts a failure rules out"""
+        if not self.preflight_enabled:
+            return set()
+        
+        self.update_status(f"🧪 Preflight: {job.video_info.filename}", 0)
+        for output_format in job.outputs:
+            self.last_failure_class = None
+            started = time.monotonic()
+            try:
+                success = self.preflight_render(input_path, overlap_frames, job.video_info, output_format)
+            except Exception as e:
+                print(f"Preflight raised for {job.video_info.filename}: {e}")
+                success = False
+            elapsed = time.monotonic() - started
+            
+            if success is None:
+                print(f"Preflight skipped for {output_format}: no tail-seek, the check would decode most of the clip")
+                continue
+            if not success:
+                failure = self.last_failure_class or 'unknown'
+                job.record_failure('preflight', failure, elapsed)
+                print(f"Preflight failed ({failure}) after {elapsed:.2f}s")
+                return FAILURE_SKIPS.get(failure, set())
+            print(f"Preflight passed for {output_format} in {elapsed:.2f}s")
+        return set()
     
     def process_single_video(self, video_info, output_path, output_format):
-        """Process a single video file"""
+        """Process a single video file through the fallback chain; returns its RenderJob"""
+        job = RenderJob(video_info, {output_format: output_path})
         try:
             # Check HAP encoder availability if HAP format is selected
             if output_format == "HAP" and not self.ff_has_hap:
@@ -2016,51 +4204,70 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
                     "• Or download ffmpeg-git-full.7z from Gyan.dev\n"
                     "• Extract and place ffmpeg.exe manually"
                 )
-                return False
+                job.failure_class = 'missing_encoder'
+                return job
             
             # Normalize input and output paths
-            input_path = self.normalize_path(video_info['path'])
+            input_path = self.normalize_path(video_info.path)
             output_path = self.normalize_path(output_path)
             
             print(f"Processing video: {input_path}")
             print(f"Output path: {output_path}")
             
-            overlap_time = self.overlap_var.get()
+            overlap_frames = self.overlap_frames_for(video_info)
             
-            # Calculate overlap frames based on mode
-            if self.overlap_mode.get() == "seconds":
-                overlap_frames = int(overlap_time * video_info['fps'])
-            else:
-                # User input is already in frames
-                overlap_frames = int(overlap_time)
-            total_frames = video_info['frame_count']
+            # A few frames through the real graph and encoder catch doomed renders early
+            skipped = self.run_preflight(job, input_path, overlap_frames)
+            if job.failure_class in FATAL_FAILURES:
+                return job
+            attempts = []
             
-            # Try the complex filter first
-            success = self.try_complex_filter_for_file(
-                input_path, output_path, overlap_frames, total_frames, output_format, video_info['fps']
-            )
+            # Long H.264 → MP4 jobs: re-encode only the crossfade, stream-copy the rest
+            smart_plan = self.plan_smart_render(video_info, overlap_frames, output_format)
+            if smart_plan:
+                attempts.append(('smart', lambda: self.try_smart_render_for_file(
+                    input_path, output_path, overlap_frames, video_info, output_format, smart_plan
+                )))
             
-            if not success:
+            # Long inputs: split the body at keyframes and render segments in parallel
+            segment_cuts = self.plan_segmented_render(video_info, overlap_frames)
+            if segment_cuts:
+                attempts.append(('segmented', lambda: self.try_segmented_render_for_file(
+                    input_path, output_path, overlap_frames, video_info, output_format, segment_cuts
+                )))
+            
+            # The full crossfade loop in one pass - in the ffmpeg graph, or blended in NumPy
+            loop_attempts = [
+                ('complex', lambda: self.try_complex_filter_for_file(
+                    input_path, output_path, overlap_frames, video_info, output_format
+                )),
+                ('pipe', lambda: self.try_pipe_render_for_file(
+                    input_path, output_path, overlap_frames, video_info, output_format
+                )),
+            ]
+            if self.render_backend == 'pipe':
+                loop_attempts.reverse()
+            attempts += loop_attempts
+            attempts += [
                 # Fallback to simple loop
-                success = self.try_simple_loop_for_file(
-                    input_path, output_path, video_info['duration'], output_format
-                )
-                
-            if not success:
+                ('simple', lambda: self.try_simple_loop_for_file(
+                    input_path, output_path, video_info, output_format
+                )),
                 # Final fallback - just copy the video as-is
-                success = self.try_basic_copy_for_file(
-                    input_path, output_path, output_format
-                )
-            
-            return success
+                ('copy', lambda: self.try_basic_copy_for_file(
+                    input_path, output_path, video_info, output_format
+                )),
+            ]
+            self.run_attempts(job, attempts, skipped)
+            return job
                 
         except Exception as e:
-            print(f"Error processing {video_info['filename']}: {str(e)}")
-            return False
+            print(f"Error processing {video_info.filename}: {str(e)}")
+            job.failure_class = job.failure_class or 'unknown'
+            return job
     
-    def build_filter_complex(self, overlap_frames, total_frames, fps=30):
-        """Build the filter complex for creating a perfect loop with crossfade"""
-        
+    def loop_timing(self, overlap_frames, total_frames, fps):
+        """Loop timing in seconds: (overlap, total, trim_start, output, fade) durations"""
         # Calculate overlap duration in seconds
         overlap_duration = overlap_frames / fps
         total_duration = total_frames / fps
@@ -2069,8 +4276,24 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
         if overlap_duration >= total_duration:
             overlap_duration = total_duration * 0.1  # Use 10% of video as fallback
         
-        # Calculate when to start the fade (end of video minus overlap)
-        fade_start_time = total_duration - overlap_duration
+        # Calculate the correct durations
+        trim_start = total_duration - overlap_duration  # Start X seconds before end
+        output_duration = total_duration - overlap_duration  # Shorter final length
+        
+        # Shorten fade by 1 frame to ensure complete fade out
+        frame_duration = 1.0 / fps
+        fade_duration = overlap_duration - frame_duration
+        
+        return overlap_duration, total_duration, trim_start, output_duration, fade_duration
+    
+    def build_filter_complex(self, overlap_frames, total_frames, fps=30, tail_offset_frames=None, pix_fmt='yuv420p'):
+        """Build the filter complex for creating a perfect loop with crossfade
+        
+        With tail_offset_frames the overlay branch reads input 1, which the caller opens
+        with an input-side seek to that frame (see plan_tail_seek), instead of decoding
+        input 0 from the start a second time. pix_fmt is the format the graph ends in;
+        yuva420p keeps the source alpha for HapAlpha outputs.
+        """
         
         # Perfect Loop Technique - Your Description:
         # 1. Duplicate clip
@@ -2085,22 +4308,75 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
         # 3. Shorten sequence to original length - X 
         # 4. Place duplicate at the START (not end!)
         # 5. Fade duplicate OUT over X seconds
-        
-        # Calculate the correct durations
-        trim_start = total_duration - overlap_duration  # Start X seconds before end
-        output_duration = total_duration - overlap_duration  # Shorter final length
+        overlap_duration, total_duration, trim_start, output_duration, fade_duration = \
+            self.loop_timing(overlap_frames, total_frames, fps)
         
         # Correct filter following your exact steps with fixes:
         # 1. Force exact frame alignment with fps filter
         # 2. Clamp fade fully to zero with color=black
         # 3. Shorten fade by 1 frame to ensure complete fade out
-        frame_duration = 1.0 / fps
-        fade_duration = overlap_duration - frame_duration
-        
-        filter_str = f"[0:v]fps={fps},trim=0:{output_duration},setpts=PTS-STARTPTS[base];[0:v]fps={fps},trim={trim_start}:{total_duration},setpts=PTS-STARTPTS,fade=t=out:st=0:d={fade_duration}:alpha=1:color=black[overlay];[base][overlay]overlay,format=yuv420p[outv]"
+        overlay_input = "[0:v]"
+        overlay_start, overlay_end = trim_start, total_duration
+        if tail_offset_frames:
+            # Seeked input: timestamps start at the keyframe, so trim relative to it
+            tail_offset = tail_offset_frames / fps
+            overlay_input = "[1:v]"
+            overlay_start, overlay_end = trim_start - tail_offset, total_duration - tail_offset
+        
+        overlay_chain = f"{overlay_input}fps={fps},trim={overlay_start}:{overlay_end},setpts=PTS-STARTPTS,fade=t=out:st=0:d={fade_duration}:alpha=1:color=black[overlay]"
+        
+        # Composite only the seam: the first overlap frames of the base are overlaid and the
+        # rest is concatenated untouched, so frames past the crossfade skip the alpha
+        # conversion and the overlay filter entirely
+        seam_frames = max(1, int(round(overlap_duration * fps)))
+        # The overlay keeps the main input's format, so an alpha-carrying base keeps its alpha
+        base_format = f",format={pix_fmt}" if pix_fmt != 'yuv420p' else ""
+        if seam_frames >= int(round(output_duration * fps)):
+            # Nothing left after the seam - overlay the whole (short) output
+            return f"[0:v]fps={fps},trim=0:{output_duration},setpts=PTS-STARTPTS{base_format}[base];{overlay_chain};[base][overlay]overlay,format={pix_fmt}[outv]"
+        
+        filter_str = (
+            f"[0:v]fps={fps},trim=0:{output_duration},setpts=PTS-STARTPTS,split[seam_src][body_src];"
+            f"[seam_src]trim=end_frame={seam_frames}{base_format}[base];"
+            f"[body_src]trim=start_frame={seam_frames},setpts=PTS-STARTPTS,format={pix_fmt}[body];"
+            f"{overlay_chain};"
+            f"[base][overlay]overlay,format={pix_fmt}[seam];"
+            f"[seam][body]concat=n=2:v=1:a=0[outv]"
+        )
         
         return filter_str
     
+    def plan_tail_seek(self, video_info, overlap_frames):
+        """Keyframe (as a frame index) to seek the overlay input to, or None to skip tail-seek"""
+        if video_info.is_vfr:
+            return None  # seeked and unseeked inputs only land on the same fps grid for CFR
+        
+        keyframes = self.get_keyframe_index(video_info)
+        if not keyframes:
+            return None
+        
+        fps = video_info.fps
+        trim_start = self.loop_timing(overlap_frames, video_info.frame_count, fps)[2]
+        keyframe = keyframe_at_or_before(keyframes, trim_start)
+        if keyframe < TAIL_SEEK_MIN_SECONDS:
+            return None  # too little decode to save to be worth a second demuxer
+        return int(round(keyframe * fps))
+    
+    def keyframe_seek_args(self, keyframe_frame, fps):
+        """Input options that start decoding exactly at the keyframe with frame index keyframe_frame.
+        
+        The target is a quarter frame past the keyframe, so rounding can never put it before
+        the keyframe (the demuxer would fall back a whole GOP), and -noaccurate_seek keeps
+        the keyframe instead of discarding frames ahead of the target. Timestamps then start
+        a quarter frame below zero, which the fps filter rounds onto index 0 - the same grid
+        as an unseeked input. Any finer positioning is left to a trim filter.
+        """
+        return ['-noaccurate_seek', '-ss', f"{(keyframe_frame + 0.25) / fps:.6f}"]
+    
+    def tail_seek_input_args(self, input_path, tail_offset_frames, fps):
+        """Second -i for the overlay branch, seeked on the input side to its keyframe"""
+        return [*self.keyframe_seek_args(tail_offset_frames, fps), '-i', input_path]
+    
     def try_complex_filter(self, overlap_frames, total_frames, output_format):
         """Try the complex filter method for creating loops"""
         try:
@@ -2159,7 +4435,7 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
         try:
             # Create a simple loop by duplicating the video
             # This creates a basic loop that can be played in a loop
-            duration = self.video_info['duration']
+            duration = self.video_info.duration
             
             ffmpeg_cmd = self._ff(
                 '-y',
@@ -2266,23 +4542,174 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
         else:
             return "18"  # Default for HAP
     
-    def try_complex_filter_for_file(self, input_path, output_path, overlap_frames, total_frames, output_format, fps=30):
-        """Try the complex filter method for a specific file"""
+    def thread_args(self, stage, share=1):
+        """ffmpeg thread options for one stage: 'decode', 'filter', 'filter_complex' or 'encode'.
+        
+        share is the number of ffmpeg processes (or encoders in one process) this job runs
+        side by side; the budget is split across those and across concurrent jobs.
+        """
+        cores = self.thread_cores or os.cpu_count() or 1
+        decode, filters, encode = plan_thread_budget(cores, self.render_concurrency * share)
+        if stage == 'decode':
+            return ['-threads', str(decode)]  # input option: place before -i
+        if stage == 'filter':
+            return ['-filter_threads', str(filters)]
+        if stage == 'filter_complex':
+            return ['-filter_complex_threads', str(filters)]
+        return ['-threads', str(encode)]  # output option: place after -i
+    
+    def hap_chunk_count(self):
+        """HAP -chunks value: one chunk per decoding core of the playback machine"""
         try:
+            cores = int(self.hap_playback_cores_var.get())
+        except (tk.TclError, ValueError):
+            cores = 0
+        return max(1, min(HAP_MAX_CHUNKS, cores or os.cpu_count() or 1))
+    
+    def hap_encoder_args(self, variant=None, share=1):
+        """Codec options for HAP: texture format, second-stage compressor and chunking"""
+        variant = variant or self.hap_variant_var.get()
+        codec_format = HAP_VARIANTS.get(variant, HAP_VARIANTS['Hap'])
+        compressor = self.hap_compressor_var.get()
+        return [
+            '-c:v', 'hap',
+            '-format', codec_format,
+            '-compressor', compressor if compressor in HAP_COMPRESSORS else 'snappy',
+            '-chunks', str(self.hap_chunk_count()),
+            '-pix_fmt', 'rgba',
+            *self.thread_args('encode', share),
+        ]
+    
+    def encoder_args(self, output_format, crf=None, share=1):
+        """Output-side codec options shared by every render path"""
+        if output_format == "HAP":
+            return self.hap_encoder_args(share=share)  # -preset/-crf mean nothing to HAP
+        if output_format == "PROXY":
+            # Lightweight review copy: fast, small H.264
+            return ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', crf or PROXY_CRF, '-pix_fmt', 'yuv420p',
+                    *self.thread_args('encode', share)]
+        return [
+            '-c:v', self.get_codec(output_format),
+            '-preset', 'fast',
+            '-crf', crf or self.get_crf_value(output_format),
+            '-pix_fmt', 'yuv420p',  # Ensure compatibility with H.264
+            *self.thread_args('encode', share),
+        ]
+    
+    def proxy_scale(self, output_format):
+        """Downscale filter for proxy outputs ('' for full-size formats)"""
+        return f"scale=-2:{PROXY_HEIGHT}" if output_format == "PROXY" else ""
+    
+    def scaled_graph(self, filter_complex, output_format):
+        """A loop graph ending in [outv], downscaled at the end when rendering a proxy"""
+        scale = self.proxy_scale(output_format)
+        if not scale:
+            return filter_complex
+        return f"{filter_complex[:-len('[outv]')]},{scale}[outv]"
+    
+    def muxer_args(self, output_format):
+        """Explicit container for a final output (its .partial path has no media extension)"""
+        return ['-f', OUTPUT_MUXERS.get(output_format, 'mp4')]
+    
+    def graph_pix_fmt(self, formats):
+        """Format the loop graph ends in: yuva420p when a HapAlpha output has to keep alpha"""
+        if "HAP" in formats and HAP_VARIANTS.get(self.hap_variant_var.get()) == 'hap_alpha':
+            return 'yuva420p'
+        return 'yuv420p'
+    
+    def loop_filter_args(self, input_path, overlap_frames, video_info, share=1, pix_fmt='yuv420p'):
+        """Input arguments (with decode/graph thread budget) and filter graph for the crossfade loop of one file"""
+        decode_threads = self.thread_args('decode', share)
+        # Open the input a second time, seeked near the tail, for the overlay branch
+        tail_offset_frames = self.plan_tail_seek(video_info, overlap_frames)
+        tail_input = [*decode_threads, *self.tail_seek_input_args(input_path, tail_offset_frames, video_info.fps)] if tail_offset_frames else []
+        filter_complex = self.build_filter_complex(
+            overlap_frames, video_info.frame_count, video_info.fps, tail_offset_frames, pix_fmt
+        )
+        input_args = [*self.thread_args('filter_complex', share), *decode_threads, '-i', input_path, *tail_input]
+        return input_args, filter_complex, tail_offset_frames
+    
+    def run_ffmpeg(self, ffmpeg_cmd, status_text, duration=0, frames=0, progress_range=(0, 100), quiet=False):
+        """Run ffmpeg, streaming its progress into the status bar.
+        
+        Progress is mapped into progress_range so multi-step renders can share one bar;
+        quiet runs (parallel segments) only capture stderr.
+        Returns (return_code, stderr_lines).
+        """
+        if not quiet:
             # Set current video info for progress tracking
-            self.current_video_duration = total_frames / fps
-            self.current_video_frames = total_frames
+            self.current_video_duration = duration
+            self.current_video_frames = frames
+        low, high = progress_range
+        
+        process = subprocess.Popen(
+            ffmpeg_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+        # Only batch jobs are cancellable; other runs (e.g. the HAP benchmark) stay untracked
+        job_index = getattr(self.job_context, 'job_index', None)
+        if job_index is not None:
+            self.job_controller.register(job_index, process)
+        
+        # Monitor progress and capture error output
+        stderr_output = []
+        try:
+            return_code = self._pump_ffmpeg_output(process, stderr_output, status_text, quiet, low, high)
+        finally:
+            if job_index is not None:
+                self.job_controller.unregister(job_index, process)
+        if return_code != 0:
+            self.last_failure_class = classify_ffmpeg_failure(stderr_output)
+        return return_code, stderr_output
+    
+    def _pump_ffmpeg_output(self, process, stderr_output, status_text, quiet, low, high):
+        """Read ffmpeg's stderr to the end, turning progress lines into status updates"""
+        last_progress = 0
+        while True:
+            output = process.stderr.readline()
+            if output == '' and process.poll() is not None:
+                break
+            if output:
+                stderr_output.append(output)
+                if quiet:
+                    continue
+                
+                # Parse actual progress from FFmpeg output
+                progress = self.parse_ffmpeg_progress(output)
+                if progress is not None and progress > last_progress:
+                    last_progress = progress
+                    self.update_status(f"{status_text}... {progress:.1f}%", low + (high - low) * progress / 100)
+                elif 'time=' in output and progress is None:
+                    # Fallback status updates
+                    if 'frame=' in output:
+                        self.update_status("🎬 Processing frames...", low + (high - low) * 0.3)
+                    elif 'speed=' in output:
+                        self.update_status("🚀 Encoding video...", low + (high - low) * 0.6)
+        
+        return process.poll()
+    
+    def try_complex_filter_for_file(self, input_path, output_path, overlap_frames, video_info, output_format):
+        """Try the complex filter method for a specific file"""
+        try:
+            total_frames = video_info.frame_count
+            fps = video_info.fps
+            
+            input_args, filter_complex, tail_offset_frames = self.loop_filter_args(
+                input_path, overlap_frames, video_info, pix_fmt=self.graph_pix_fmt([output_format])
+            )
+            filter_complex = self.scaled_graph(filter_complex, output_format)
             
             # Build ffmpeg command for crossfade loop
             ffmpeg_cmd = self._ff(
                 '-y',  # Overwrite output
-                '-i', input_path,  # Input video
-                '-filter_complex', self.build_filter_complex(overlap_frames, total_frames, fps),
+                *input_args,
+                '-filter_complex', filter_complex,
                 '-map', '[outv]',  # Map the output from filter complex
-                '-c:v', self.get_codec(output_format),
-                '-preset', 'fast',
-                '-crf', self.get_crf_value(output_format),
-                '-pix_fmt', 'yuv420p',  # Ensure compatibility with H.264
+                *self.encoder_args(output_format),
+                *self.muxer_args(output_format),
                 output_path
             )
             
@@ -2294,8 +4721,9 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
             print("Overlap frames:", overlap_frames)
             print("Total frames:", total_frames)
             print("FPS:", fps)
+            print("Tail-seek keyframe:", tail_offset_frames if tail_offset_frames else "off")
             print("Filter complex:")
-            print(self.build_filter_complex(overlap_frames, total_frames, fps))
+            print(filter_complex)
             print("FFmpeg command:", ' '.join(ffmpeg_cmd))
             print("=" * 60)
             
@@ -2305,209 +4733,598 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
                 print("ERROR: FFmpeg not available - this should not happen!")
                 return False
             
-            # Execute ffmpeg command
-            process = subprocess.Popen(
-                ffmpeg_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            return_code, stderr_output = self.run_ffmpeg(
+                ffmpeg_cmd, "🎬 Rendering perfect loop", total_frames / fps, total_frames
             )
             
-            # Monitor progress and capture error output
-            stderr_output = []
-            last_progress = 0
-            
-            while True:
-                output = process.stderr.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    stderr_output.append(output)
-                    
-                    # Parse actual progress from FFmpeg output
-                    progress = self.parse_ffmpeg_progress(output)
-                    if progress is not None and progress > last_progress:
-                        last_progress = progress
-                        self.update_status(f"🎬 Rendering perfect loop... {progress:.1f}%", progress)
-                    elif 'time=' in output and progress is None:
-                        # Fallback status updates
-                        if 'frame=' in output:
-                            self.update_status("🎬 Processing frames...", 30)
-                        elif 'speed=' in output:
-                            self.update_status("🚀 Encoding video...", 60)
-            
             # Set to 100% when complete
             self.update_status("✅ Loop rendering complete!", 100)
             
-            return_code = process.poll()
             if return_code != 0:
                 print("Complex filter stderr:", '\n'.join(stderr_output))
                 # Log actual FFmpeg errors for debugging
                 error_output = '\n'.join(stderr_output)
                 print(f"FFmpeg error details: {error_output}")
             return return_code == 0
-            
+        
         except Exception as e:
             print(f"Complex filter failed for {input_path}: {e}")
             return False
     
-    def try_simple_loop_for_file(self, input_path, output_path, duration, output_format):
+    def try_multi_output_for_file(self, input_path, outputs, overlap_frames, video_info):
+        """Render several formats from one decode: the loop graph is split into one encoder per output"""
+        try:
+            fps = video_info.fps
+            formats = list(outputs)
+            input_args, filter_complex, _ = self.loop_filter_args(
+                input_path, overlap_frames, video_info, pix_fmt=self.graph_pix_fmt(formats)
+            )
+            
+            # Fan the composited loop out to every encoder; proxies get their own scaler
+            labels = [f"[out{i}]" for i in range(len(formats))]
+            split_labels = [f"[split{i}]" if fmt == "PROXY" else label for i, (fmt, label) in enumerate(zip(formats, labels))]
+            filter_complex += f";[outv]split={len(formats)}{''.join(split_labels)}"
+            for fmt, split_label, label in zip(formats, split_labels, labels):
+                if fmt == "PROXY":
+                    filter_complex += f";{split_label}{self.proxy_scale(fmt)}{label}"
+            
+            output_args = []
+            for fmt, label in zip(formats, labels):
+                output_args += ['-map', label, *self.encoder_args(fmt, share=len(formats)), *self.muxer_args(fmt), outputs[fmt]]
+            ffmpeg_cmd = self._ff('-y', *input_args, '-filter_complex', filter_complex, *output_args)
+            
+            print("Multi-output command:", ' '.join(ffmpeg_cmd))
+            _, _, _, output_duration, _ = self.loop_timing(overlap_frames, video_info.frame_count, fps)
+            return_code, stderr_output = self.run_ffmpeg(
+                ffmpeg_cmd, f"🎬 Rendering {' + '.join(formats)}", output_duration, int(round(output_duration * fps))
+            )
+            if return_code != 0:
+                print("Multi-output stderr:", '\n'.join(stderr_output))
+                return False
+            
+            self.update_status("✅ Multi-output render complete!", 100)
+            return True
+            
+        except Exception as e:
+            print(f"Multi-output render failed for {input_path}: {e}")
+            return False
+    
+    def plan_smart_render(self, video_info, overlap_frames, output_format):
+        """(head_end, tail_start, output_frames, profile_args) for smart render, or None.
+        
+        Smart render re-encodes only [0, head_end) - the crossfade plus the rest of its
+        GOP - and [tail_start, output_frames) - the GOP cut by the trim point - and
+        stream-copies the untouched GOPs in between. profile_args make the re-encoded
+        parts use the source's H.264 profile and level.
+        """
+        if not self.smart_render_enabled or output_format != "MP4":
+            return None
+        if video_info.codec_name != 'h264' or video_info.is_vfr:
+            return None  # copied GOPs must already be H.264 on a constant frame grid
+        if video_info.pix_fmt != 'yuv420p':
+            return None  # libx264 re-encodes 8-bit 4:2:0; anything else would mix SPS in one stream
+        if video_info.duration < SMART_RENDER_MIN_SECONDS:
+            return None
+        profile_args = self.h264_profile_args(video_info)
+        if profile_args is None:
+            return None
+        
+        keyframes = self.get_keyframe_index(video_info)
+        if not keyframes:
+            return None
+        
+        fps = video_info.fps
+        overlap_duration, _, _, output_duration, _ = self.loop_timing(overlap_frames, video_info.frame_count, fps)
+        output_frames = int(round(output_duration * fps))
+        
+        head_keyframe = keyframe_at_or_after(keyframes, overlap_duration)
+        if head_keyframe is None:
+            return None
+        head_end = int(round(head_keyframe * fps))
+        tail_start = int(round(keyframe_at_or_before(keyframes, output_duration) * fps))
+        
+        if tail_start <= head_end or (tail_start - head_end) < output_frames * SMART_RENDER_MIN_COPY_FRACTION:
+            return None  # not enough copyable GOPs to beat a plain re-encode
+        return head_end, tail_start, output_frames, profile_args
+    
+    def h264_profile_args(self, video_info):
+        """libx264 -profile:v/-level:v matching an H.264 input (from the probe), or None if it can't be matched"""
+        profile = SMART_RENDER_PROFILES.get(video_info.profile)
+        level = video_info.level
+        if profile is None or not isinstance(level, int) or level <= 0:
+            return None
+        return ['-profile:v', profile, '-level:v', '1b' if level == 9 else f"{level / 10:.1f}"]
+    
+    def try_smart_render_for_file(self, input_path, output_path, overlap_frames, video_info, output_format, plan):
+        """Re-encode only the crossfade and boundary GOPs, stream-copy the rest, then concat"""
+        head_end, tail_start, output_frames, profile_args = plan
+        fps = video_info.fps
+        work_dir = tempfile.mkdtemp(prefix='looper_smart_')
+        try:
+            head_path = os.path.join(work_dir, 'head.ts')
+            body_path = os.path.join(work_dir, 'body.ts')
+            tail_path = os.path.join(work_dir, 'tail.ts')
+            # MPEG-TS parts keep SPS/PPS in-band, so encoded and copied GOPs can be joined
+            annexb = ['-bsf:v', 'h264_mp4toannexb', '-f', 'mpegts']
+            
+            # 1. Crossfade GOP(s): the normal loop graph, stopped at the first copyable keyframe
+            input_args, filter_complex, _ = self.loop_filter_args(input_path, overlap_frames, video_info)
+            head_cmd = self._ff(
+                '-y', *input_args,
+                '-filter_complex', filter_complex,
+                '-map', '[outv]',
+                '-frames:v', str(head_end),
+                *self.encoder_args(output_format), *profile_args,
+                *annexb, head_path
+            )
+            
+            # 2. Untouched GOPs: seek a quarter frame past the keyframe so the demuxer
+            #    lands exactly on it, then copy whole GOPs without decoding
+            body_cmd = self._ff(
+                '-y', '-ss', f"{(head_end + 0.25) / fps:.6f}", '-i', input_path,
+                '-map', '0:v:0', '-c:v', 'copy',
+                '-frames:v', str(tail_start - head_end),
+                '-avoid_negative_ts', 'make_zero',
+                *annexb, body_path
+            )
+            
+            # 3. Boundary GOP at the trim point, re-encoded up to the last output frame
+            tail_cmd = self._ff(
+                '-y', *self.thread_args('decode'), *self.keyframe_seek_args(tail_start, fps), '-i', input_path,
+                '-map', '0:v:0', *self.thread_args('filter'), '-vf', f"fps={fps}",
+                '-frames:v', str(output_frames - tail_start),
+                *self.encoder_args(output_format), *profile_args,
+                *annexb, tail_path
+            )
+            
+            steps = [
+                (head_cmd, "🎬 Smart render: crossfade", head_end, (0, 40)),
+                (body_cmd, "📋 Smart render: copying GOPs", tail_start - head_end, (40, 70)),
+            ]
+            parts = [head_path, body_path]
+            if output_frames > tail_start:
+                # A trim point exactly on a keyframe leaves no boundary GOP to re-encode
+                steps.append((tail_cmd, "🎬 Smart render: trim point", output_frames - tail_start, (70, 90)))
+                parts.append(tail_path)
+            for cmd, status_text, frames, progress_range in steps:
+                print("Smart render command:", ' '.join(cmd))
+                return_code, stderr_output = self.run_ffmpeg(cmd, status_text, frames / fps, frames, progress_range)
+                if return_code != 0:
+                    print("Smart render stderr:", '\n'.join(stderr_output))
+                    return False
+            
+            # 4. Join the three parts losslessly with the concat demuxer
+            list_path = os.path.join(work_dir, 'concat.txt')
+            with open(list_path, 'w', encoding='utf-8') as f:
+                for part in parts:
+                    escaped = self.normalize_path(part).replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+            concat_cmd = self._ff(
+                '-y', '-f', 'concat', '-safe', '0', '-i', list_path,
+                '-c', 'copy', '-movflags', '+faststart', *self.muxer_args(output_format), output_path
+            )
+            return_code, stderr_output = self.run_ffmpeg(
+                concat_cmd, "🔗 Smart render: joining", output_frames / fps, output_frames, (90, 99)
+            )
+            if return_code != 0:
+                print("Smart render concat stderr:", '\n'.join(stderr_output))
+                return False
+            
+            if not self.decodes_cleanly(output_path, output_frames):
+                print("Smart render output failed the decode check - discarding")
+                return False
+            
+            self.update_status("✅ Smart render complete!", 100)
+            return True
+        
+        except Exception as e:
+            print(f"Smart render failed for {input_path}: {e}")
+            return False
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    def segment_worker_count(self):
+        """Parallel ffmpeg processes for segmented rendering (0 in settings = auto)"""
+        if self.segment_workers > 0:
+            return self.segment_workers
+        return max(1, min(SEGMENT_RENDER_MAX_AUTO_WORKERS, (os.cpu_count() or 1) // 4))
+    
+    def segment_container_args(self, output_format):
+        """Intermediate container for independently encoded segments: (extension, muxer args)"""
+        if output_format == "HAP":
+            return '.mov', ['-f', 'mov']  # intra-only, joins cleanly
+        # MPEG-TS keeps SPS/PPS in-band so H.264 segments join losslessly
+        return '.ts', ['-bsf:v', 'h264_mp4toannexb', '-f', 'mpegts']
+    
+    def plan_segmented_render(self, video_info, overlap_frames):
+        """Keyframe cut points [0, c1, ..., output_frames] for a segment-parallel render, or None.
+        
+        The first segment holds the crossfade and runs the loop graph; the rest are plain
+        re-encodes of the body, started at clean (closed-GOP) keyframes so each one decodes
+        independently.
+        """
+        workers = self.segment_worker_count()
+        if workers < 2 or video_info.is_vfr or video_info.duration < SEGMENT_RENDER_MIN_SECONDS:
+            return None
+        
+        keyframes = self.get_keyframe_index(video_info)
+        if not keyframes:
+            return None
+        
+        fps = video_info.fps
+        overlap_duration, _, _, output_duration, _ = self.loop_timing(overlap_frames, video_info.frame_count, fps)
+        output_frames = int(round(output_duration * fps))
+        
+        head_keyframe = keyframe_at_or_after(keyframes, overlap_duration)
+        if head_keyframe is None:
+            return None
+        head_end = int(round(head_keyframe * fps))
+        
+        # Spread the body evenly over the workers, snapping each cut back to a keyframe
+        cuts = [0, head_end]
+        body_frames = output_frames - head_end
+        for k in range(1, workers):
+            target = (head_end + body_frames * k / workers) / fps
+            cut = int(round(keyframe_at_or_before(keyframes, target) * fps))
+            if cut > cuts[-1] and cut < output_frames:
+                cuts.append(cut)
+        cuts.append(output_frames)
+        
+        if len(cuts) < 4 or head_end >= output_frames:
+            return None  # fewer than two body segments - no parallelism to gain
+        return cuts
+    
+    def try_segmented_render_for_file(self, input_path, output_path, overlap_frames, video_info, output_format, cuts):
+        """Render keyframe-aligned segments in parallel ffmpeg processes and concat them"""
+        fps = video_info.fps
+        output_frames = cuts[-1]
+        extension, container_args = self.segment_container_args(output_format)
+        work_dir = tempfile.mkdtemp(prefix='looper_segments_')
+        workers = self.segment_worker_count()
+        try:
+            commands = []
+            input_args, filter_complex, _ = self.loop_filter_args(
+                input_path, overlap_frames, video_info, share=workers, pix_fmt=self.graph_pix_fmt([output_format])
+            )
+            filter_complex = self.scaled_graph(filter_complex, output_format)
+            body_filter = ','.join(filter(None, (f"fps={fps}", self.proxy_scale(output_format))))
+            for i, (start, end) in enumerate(zip(cuts, cuts[1:])):
+                segment_path = os.path.join(work_dir, f"segment_{i:04d}{extension}")
+                if i == 0:
+                    # Crossfade segment: the loop graph, stopped at the first body keyframe
+                    cmd = self._ff(
+                        '-y', *input_args,
+                        '-filter_complex', filter_complex,
+                        '-map', '[outv]',
+                        '-frames:v', str(end),
+                        *self.encoder_args(output_format, share=workers),
+                        *container_args, segment_path
+                    )
+                else:
+                    # Body segment: input seek straight onto its keyframe, plain re-encode
+                    cmd = self._ff(
+                        '-y', *self.thread_args('decode', workers),
+                        *self.keyframe_seek_args(start, fps), '-i', input_path,
+                        '-map', '0:v:0', *self.thread_args('filter', workers), '-vf', body_filter,
+                        '-frames:v', str(end - start),
+                        *self.encoder_args(output_format, share=workers),
+                        *container_args, segment_path
+                    )
+                commands.append((segment_path, cmd))
+            
+            total = len(commands)
+            print(f"Segmented render: {total} segments on {workers} workers, cuts {cuts}")
+            self.update_status(f"🧩 Rendering {total} segments in parallel...", 0)
+            
+            completed = 0
+            failed = threading.Event()
+            job_index = getattr(self.job_context, 'job_index', None)
+            
+            def run_segment(cmd):
+                if failed.is_set():
+                    return None, []  # another segment already failed
+                self.job_context.job_index = job_index  # pool thread: register under the owning job
+                return self.run_ffmpeg(cmd, "", quiet=True)
+            
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(run_segment, cmd): path for path, cmd in commands}
+                for future in concurrent.futures.as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    return_code, stderr_output = future.result()
+                    if failed.is_set():
+                        continue  # skipped or killed after the first failure
+                    if return_code != 0:
+                        print(f"Segment {futures[future]} failed:", '\n'.join(stderr_output))
+                        self.last_failure_class = classify_ffmpeg_failure(stderr_output)  # ran on a pool thread
+                        # The render is lost - free the cores for the fallback right away
+                        failed.set()
+                        for pending in futures:
+                            pending.cancel()
+                        self.job_controller.stop(job_index)
+                        continue
+                    completed += 1
+                    self.update_status(f"🧩 Segments rendered: {completed}/{total}", completed / total * 90)
+            if failed.is_set():
+                return False
+            
+            # Join losslessly with the concat demuxer
+            list_path = os.path.join(work_dir, 'concat.txt')
+            with open(list_path, 'w', encoding='utf-8') as f:
+                for segment_path, _ in commands:
+                    escaped = self.normalize_path(segment_path).replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+            concat_cmd = self._ff(
+                '-y', '-f', 'concat', '-safe', '0', '-i', list_path,
+                '-c', 'copy', *(['-movflags', '+faststart'] if output_format == "MP4" else []),
+                *self.muxer_args(output_format), output_path
+            )
+            return_code, stderr_output = self.run_ffmpeg(
+                concat_cmd, "🔗 Joining segments", output_frames / fps, output_frames, (90, 99)
+            )
+            if return_code != 0:
+                print("Segment concat stderr:", '\n'.join(stderr_output))
+                return False
+            
+            if not self.decodes_cleanly(output_path, output_frames):
+                print("Segmented render output failed the decode check - discarding")
+                return False
+            
+            self.update_status("✅ Segmented render complete!", 100)
+            return True
+            
+        except Exception as e:
+            print(f"Segmented render failed for {input_path}: {e}")
+            return False
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    def decodes_cleanly(self, video_path, expected_frames):
+        """Decode a joined render end to end; True if all expected frames decode without errors.
+        
+        Counting packets proves nothing here - the parts' -frames:v limits already add up -
+        but a part that starts on a GOP referencing pictures it doesn't contain makes the
+        decoder report missing references or drop frames.
+        """
+        errors = []
+        data = self._run_ffprobe_json([
+            '-v', 'error', '-select_streams', 'v:0', '-count_frames',
+            '-show_entries', 'stream=nb_read_frames', '-of', 'json', video_path
+        ], stderr_lines=errors)
+        decoded = int(((data.get('streams') or [{}])[0]).get('nb_read_frames') or 0)
+        if errors or decoded != expected_frames:
+            print(f"Decode check: {decoded} of {expected_frames} frames decoded, {len(errors)} errors")
+            print('\n'.join(errors[:10]))
+            return False
+        return True
+    
+    def try_pipe_render_for_file(self, input_path, output_path, overlap_frames, video_info, output_format):
+        """Render the loop without the overlay graph: decode to raw frames, blend in NumPy, encode from stdin.
+        
+        A second decoder reads the tail in lockstep with the first overlap frames, so only
+        two frames are ever held. Frames travel as planar 8-bit YUV - the same format the
+        filter graph blends in - so the crossfade is applied per plane and every frame after
+        the seam reaches the encoder without any colour conversion.
+        """
+        fps = video_info.fps
+        width, height = video_info.width, video_info.height
+        overlap_duration, _, _, output_duration, _ = self.loop_timing(overlap_frames, video_info.frame_count, fps)
+        seam_frames = max(1, int(round(overlap_duration * fps)))
+        output_frames = int(round(output_duration * fps))
+        tail_start = video_info.frame_count - seam_frames
+        
+        # yuvj keeps a full-range source full range; alpha rides along as a fourth plane
+        if has_alpha(video_info.pix_fmt):
+            pix_fmt = 'yuva420p'
+        elif (video_info.pix_fmt or '').startswith('yuvj'):
+            pix_fmt = 'yuvj420p'
+        else:
+            pix_fmt = 'yuv420p'
+        luma_bytes = width * height
+        chroma_bytes = ((width + 1) // 2) * ((height + 1) // 2)
+        # The blend is the same for every sample, so the planes are blended as one flat buffer
+        frame_bytes = luma_bytes * (2 if pix_fmt == 'yuva420p' else 1) + 2 * chroma_bytes
+        # Passthrough: rawvideo would otherwise impose CFR sync at a guessed rate (25 fps once
+        # setpts drops the frame rate) and silently drop or duplicate frames
+        raw_out = ['-fps_mode', 'passthrough', '-f', 'rawvideo', '-pix_fmt', pix_fmt, '-']
+        share = 3  # two decoders and an encoder split the job's thread budget
+        
+        base_cmd = self._ff(
+            *self.thread_args('decode', share), '-i', input_path,
+            '-map', '0:v:0', *self.thread_args('filter', share), '-vf', f"fps={fps}",
+            '-frames:v', str(output_frames), *raw_out
+        )
+        # Seek the tail decoder onto the keyframe before the tail and trim the rest of the
+        # way; with no usable keyframe (or a variable frame grid) it decodes from the start
+        keyframes = None if video_info.is_vfr else self.get_keyframe_index(video_info)
+        keyframe_frame = int(round(keyframe_at_or_before(keyframes, tail_start / fps) * fps)) if keyframes else 0
+        seek_args = self.keyframe_seek_args(keyframe_frame, fps) if keyframe_frame > 0 else []
+        tail_cmd = self._ff(
+            *self.thread_args('decode', share), *seek_args, '-i', input_path,
+            '-map', '0:v:0', *self.thread_args('filter', share),
+            '-vf', f"fps={fps},trim=start_frame={tail_start - keyframe_frame},setpts=PTS-STARTPTS",
+            '-frames:v', str(seam_frames), *raw_out
+        )
+        encode_cmd = self._ff(
+            '-y', '-f', 'rawvideo', '-pix_fmt', pix_fmt, '-s', f"{width}x{height}", '-r', f"{fps}",
+            '-i', '-', *(['-vf', self.proxy_scale(output_format)] if output_format == "PROXY" else []),
+            *self.encoder_args(output_format, share=share), *self.muxer_args(output_format), output_path
+        )
+        
+        # Fade-out ramp of the tail copy in 1/256 steps, matching fade=t=out over seam_frames - 1
+        ramp = [int(round(256 * max(0.0, 1.0 - i / max(1, seam_frames - 1)))) for i in range(seam_frames)]
+        
+        # Preallocated buffers, reused for every frame
+        base_buf, tail_buf, out_buf = bytearray(frame_bytes), bytearray(frame_bytes), bytearray(frame_bytes)
+        base_view, tail_view = memoryview(base_buf), memoryview(tail_buf)
+        base_px = np.frombuffer(base_buf, dtype=np.uint8)
+        tail_px = np.frombuffer(tail_buf, dtype=np.uint8)
+        out_px = np.frombuffer(out_buf, dtype=np.uint8)
+        acc = np.empty(frame_bytes, dtype=np.uint16)
+        tmp = np.empty(frame_bytes, dtype=np.uint16)
+        
+        processes = []
+        job_index = getattr(self.job_context, 'job_index', None)
+        stderr_files = [tempfile.TemporaryFile() for _ in range(3)]
+        try:
+            popen_flags = subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            for cmd, stderr_file, pipe_in in zip((base_cmd, tail_cmd, encode_cmd), stderr_files, (False, False, True)):
+                processes.append(subprocess.Popen(
+                    cmd,
+                    stdin=subprocess.PIPE if pipe_in else subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL if pipe_in else subprocess.PIPE,
+                    stderr=stderr_file,
+                    bufsize=frame_bytes,
+                    creationflags=popen_flags
+                ))
+                if job_index is not None:
+                    self.job_controller.register(job_index, processes[-1])
+            base_proc, tail_proc, encode_proc = processes
+            
+            progress_step = max(1, output_frames // 100)
+            i = 0
+            try:
+                for i in range(output_frames):
+                    if not read_exact(base_proc.stdout, base_view):
+                        print(f"Pipe render: base decoder ended at frame {i} of {output_frames}")
+                        break
+                    # Consume every tail frame (even fully faded ones) so the decoder can exit
+                    if i < seam_frames and not read_exact(tail_proc.stdout, tail_view):
+                        print(f"Pipe render: tail decoder ended at frame {i} of {seam_frames}")
+                        break
+                    if i < seam_frames and ramp[i] > 0:
+                        # out = (tail * w + base * (256 - w) + 128) >> 8, all in uint16
+                        np.multiply(base_px, 256 - ramp[i], out=acc, dtype=np.uint16)
+                        np.multiply(tail_px, ramp[i], out=tmp, dtype=np.uint16)
+                        acc += tmp
+                        acc += 128
+                        acc >>= 8
+                        np.copyto(out_px, acc, casting='unsafe')
+                        encode_proc.stdin.write(out_buf)
+                    else:
+                        encode_proc.stdin.write(base_view)  # untouched frame: straight through
+                    
+                    if i % progress_step == 0:
+                        self.update_status(f"🧮 Pipe render... {i / output_frames * 100:.1f}%", i / output_frames * 100)
+                else:
+                    i = output_frames
+            except OSError as e:
+                # BrokenPipeError: the encoder exited early - its stderr below says why
+                print(f"Pipe render: encoder stopped accepting frames at frame {i}: {e}")
+            
+            try:
+                encode_proc.stdin.close()
+            except OSError:
+                pass  # encoder already gone
+            if i != output_frames:
+                # A decoder that is still running would block forever writing to a pipe
+                # nobody reads - close our ends and stop both before waiting
+                for process in (base_proc, tail_proc):
+                    process.stdout.close()
+                    if process.poll() is None:
+                        process.terminate()
+            return_codes = []
+            for process in processes:
+                try:
+                    # The encoder got EOF and must be allowed to flush; only stopped decoders are timed out
+                    timeout = JOB_TERMINATE_TIMEOUT if process is not encode_proc and i != output_frames else None
+                    return_codes.append(process.wait(timeout=timeout))
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    return_codes.append(process.wait())
+            if i != output_frames or any(return_codes):
+                stderr_lines = []
+                for stderr_file in stderr_files:
+                    stderr_file.seek(0)
+                    stderr_lines += stderr_file.read().decode('utf-8', 'replace').splitlines(keepends=True)
+                print("Pipe render stderr:", ''.join(stderr_lines))
+                self.last_failure_class = classify_ffmpeg_failure(stderr_lines)
+                return False
+            
+            self.update_status("✅ Pipe render complete!", 100)
+            return True
+            
+        except Exception as e:
+            print(f"Pipe render failed for {input_path}: {e}")
+            return False
+        finally:
+            for process in processes:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+                if job_index is not None:
+                    self.job_controller.unregister(job_index, process)
+            for stderr_file in stderr_files:
+                stderr_file.close()
+    
+    def try_simple_loop_for_file(self, input_path, output_path, video_info, output_format):
         """Try a simpler method for a specific file"""
         try:
-            # Set current video info for progress tracking
-            self.current_video_duration = duration * 2  # Double duration for loop
-            self.current_video_frames = int(duration * 2 * 30)  # Estimate frames
+            duration = video_info.duration
             
             ffmpeg_cmd = self._ff(
                 '-y',
+                *self.thread_args('decode'),
                 '-i', input_path,
-                '-filter_complex', f'[0:v]loop=loop=1:size=1,trim=duration={duration*2}[outv]',
+                *self.thread_args('filter_complex'),
+                '-filter_complex', self.scaled_graph(f'[0:v]loop=loop=1:size=1,trim=duration={duration*2}[outv]', output_format),
                 '-map', '[outv]',
-                '-c:v', self.get_codec(output_format),
-                '-preset', 'fast',
-                '-crf', self.get_crf_value(output_format),
-                '-pix_fmt', 'yuv420p',
+                *self.encoder_args(output_format),
+                *self.muxer_args(output_format),
                 output_path
             )
             
-            process = subprocess.Popen(
-                ffmpeg_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            # Double duration for loop
+            return_code, stderr_output = self.run_ffmpeg(
+                ffmpeg_cmd, "🎬 Processing simple loop", duration * 2, video_info.frame_count * 2
             )
             
-            # Monitor progress and capture error output
-            stderr_output = []
-            last_progress = 0
-            
-            while True:
-                output = process.stderr.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    stderr_output.append(output)
-                    
-                    # Parse actual progress from FFmpeg output
-                    progress = self.parse_ffmpeg_progress(output)
-                    if progress is not None and progress > last_progress:
-                        last_progress = progress
-                        self.update_status(f"🎬 Processing simple loop... {progress:.1f}%", progress)
-                    elif 'time=' in output and progress is None:
-                        # Fallback status updates
-                        if 'frame=' in output:
-                            self.update_status("🎬 Processing frames...", 30)
-                        elif 'speed=' in output:
-                            self.update_status("🚀 Encoding video...", 60)
-            
             # Set to 100% when complete
             self.update_status("✅ Simple loop complete!", 100)
             
-            return_code = process.poll()
             if return_code != 0:
                 print("Simple loop stderr:", '\n'.join(stderr_output))
                 # Log actual FFmpeg errors for debugging
                 error_output = '\n'.join(stderr_output)
                 print(f"FFmpeg error details: {error_output}")
             return return_code == 0
-            
+        
         except Exception as e:
             print(f"Simple loop failed for {input_path}: {e}")
             return False
     
-    def try_basic_copy_for_file(self, input_path, output_path, output_format):
+    def try_basic_copy_for_file(self, input_path, output_path, video_info, output_format):
         """Try basic copy for a specific file"""
         try:
-            # Get video duration for progress tracking
-            cap = cv2.VideoCapture(input_path)
-            if cap.isOpened():
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                self.current_video_duration = frame_count / fps if fps > 0 else 0
-                self.current_video_frames = frame_count
-                cap.release()
-            else:
-                self.current_video_duration = 0
-                self.current_video_frames = 0
-            
             ffmpeg_cmd = self._ff(
                 '-y',
+                *self.thread_args('decode'),
                 '-i', input_path,
-                '-c:v', self.get_codec(output_format),
-                '-preset', 'fast',
-                '-crf', '18',
-                '-pix_fmt', 'yuv420p',
+                *(['-vf', self.proxy_scale(output_format)] if output_format == "PROXY" else []),
+                *self.encoder_args(output_format, crf='18'),
+                *self.muxer_args(output_format),
                 output_path
             )
             
-            process = subprocess.Popen(
-                ffmpeg_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            # Progress tracking comes from the probe - no need to reopen the input
+            return_code, stderr_output = self.run_ffmpeg(
+                ffmpeg_cmd, "📋 Copying video", video_info.duration, video_info.frame_count
             )
             
-            # Monitor progress and capture error output
-            stderr_output = []
-            last_progress = 0
-            
-            while True:
-                output = process.stderr.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    stderr_output.append(output)
-                    
-                    # Parse actual progress from FFmpeg output
-                    progress = self.parse_ffmpeg_progress(output)
-                    if progress is not None and progress > last_progress:
-                        last_progress = progress
-                        self.update_status(f"📋 Copying video... {progress:.1f}%", progress)
-                    elif 'time=' in output and progress is None:
-                        # Fallback status updates
-                        if 'frame=' in output:
-                            self.update_status("🎬 Processing frames...", 20)
-                        elif 'speed=' in output:
-                            self.update_status("🚀 Encoding video...", 40)
-            
             # Set to 100% when complete
             self.update_status("✅ Basic copy complete!", 100)
             
-            return_code = process.poll()
             if return_code != 0:
                 print("Basic copy stderr:", '\n'.join(stderr_output))
                 # Log actual FFmpeg errors for debugging
                 error_output = '\n'.join(stderr_output)
                 print(f"FFmpeg error details: {error_output}")
             return return_code == 0
-            
+        
         except Exception as e:
             print(f"Basic copy failed for {input_path}: {e}")
             return False
     
-    def update_status(self, message, progress):
-        """Update status with thread-safe GUI updates"""
-        def update():
-            self.status_label.config(text=message)
-            self.progress_var.set(progress)
-            
-            # Update custom progress bar
-            if hasattr(self, 'progress_bar_fill') and hasattr(self, 'progress_label'):
-                # Calculate width based on progress percentage
-                total_width = self.progress_bar_frame.winfo_width()
-                if total_width > 0:
-                    fill_width = int((progress / 100.0) * total_width)
-                    self.progress_bar_fill.config(width=fill_width)
-                
-                # Update percentage label
-                self.progress_label.config(text=f"{progress:.1f}%")
-            
-            self.root.update_idletasks()
-        self.root.after(0, update)
-    
     def parse_ffmpeg_progress(self, line):
         """Parse FFmpeg progress output and return progress percentage"""
         try:
@@ -2523,7 +5340,7 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
             
             # Look for frame progress: frame= 1234
             frame_match = re.search(r'frame=\s*(\d+)', line)
-            if frame_match and hasattr(self, 'current_video_frames') and self.current_video_frames > 0:
+            if frame_match and self.current_video_frames > 0:
                 current_frame = int(frame_match.group(1))
                 progress = min(95, (current_frame / self.current_video_frames) * 100)
                 return progress
@@ -2546,28 +5363,58 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
         try:
             if os.path.exists('looper_settings.json'):
                 with open('looper_settings.json', 'r') as f:
-                    settings = json.load(f)
-                    self.overlap_var.set(settings.get('overlap_time', 1.0))
-                    self.overlap_mode.set(settings.get('overlap_mode', 'seconds'))
-                    self.format_var.set(settings.get('output_format', 'HAP'))
-                    self.quality_var.set(settings.get('quality_crf', 18))
-                    # Recent files functionality removed
-                    
-                    # Update UI based on loaded settings
-                    if self.overlap_mode.get() == "frames":
-                        self.overlap_toggle.config(text="FRAMES")
-                        self.overlap_spinbox.config(from_=1, to=300, increment=1)
+                    self.apply_settings(json.load(f))
         except:
             pass
+        self.open_render_cache()
+    
+    def apply_settings(self, settings):
+        """Apply a settings dict (looper_settings.json, or a journaled batch's snapshot)"""
+        self.overlap_var.set(settings.get('overlap_time', 1.0))
+        self.overlap_mode.set(settings.get('overlap_mode', 'seconds'))
+        self.format_var.set(settings.get('output_format', 'HAP'))
+        self.quality_var.set(settings.get('quality_crf', 18))
+        self.hap_variant_var.set(settings.get('hap_variant', 'Hap'))
+        self.hap_compressor_var.set(settings.get('hap_compressor', 'snappy'))
+        self.hap_playback_cores_var.set(settings.get('hap_playback_cores', 0))
+        self.probe_mode = settings.get('probe_mode', 'fast')
+        self.smart_render_enabled = settings.get('smart_render', True)
+        self.segment_workers = int(settings.get('segment_workers', 0))
+        self.preflight_enabled = settings.get('preflight', True)
+        self.thread_cores = int(settings.get('thread_cores', 0))
+        self.concurrent_jobs = int(settings.get('concurrent_jobs', 0))
+        job_order = settings.get('job_order', 'queue')
+        self.job_order = job_order if job_order in JOB_ORDER_POLICIES else 'queue'
+        self.memory_admission = bool(settings.get('memory_admission', True))
+        render_backend = settings.get('render_backend', 'filter')
+        self.render_backend = render_backend if render_backend in RENDER_BACKENDS else 'filter'
+        self.render_cache_enabled = settings.get('render_cache', True)
+        self.render_cache_max_gb = float(settings.get('render_cache_max_gb', RENDER_CACHE_MAX_GB))
+        # Recent files functionality removed
+        
+        # Update UI based on loaded settings
+        if self.overlap_mode.get() == "frames":
+            self.overlap_toggle.config(text="FRAMES")
+            self.overlap_spinbox.config(from_=1, to=300, increment=1)
+        else:
+            self.overlap_toggle.config(text="SEC")
+            self.overlap_spinbox.config(from_=0.1, to=10.0, increment=0.1)
+    
+    def open_render_cache(self):
+        """Open the render cache (optional - renders simply always run without it)"""
+        if not self.render_cache_enabled:
+            self.render_cache = None
+            return
+        try:
+            self.render_cache = RenderCache(
+                CACHE_DB_FILE, RENDER_CACHE_DIR, int(self.render_cache_max_gb * 1024 ** 3)
+            )
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Render cache unavailable: {e}")
+            self.render_cache = None
     
     def save_settings(self):
-        settings = {
-            'overlap_time': self.overlap_var.get(),
-            'overlap_mode': self.overlap_mode.get(),
-            'output_format': self.format_var.get(),
-            'quality_crf': self.quality_var.get(),
-            'recent_files': []  # Recent files functionality removed
-        }
+        settings = self.current_settings()
         
         try:
             with open('looper_settings.json', 'w') as f:
@@ -2575,6 +5422,30 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
         except:
             pass
     
+    def current_settings(self):
+        """Every persisted setting as a dict (also the snapshot journaled with each batch)"""
+        return {
+            'overlap_time': self.overlap_var.get(),
+            'overlap_mode': self.overlap_mode.get(),
+            'output_format': self.format_var.get(),
+            'quality_crf': self.quality_var.get(),
+            'hap_variant': self.hap_variant_var.get(),
+            'hap_compressor': self.hap_compressor_var.get(),
+            'hap_playback_cores': self.hap_playback_cores_var.get(),
+            'probe_mode': self.probe_mode,
+            'smart_render': self.smart_render_enabled,
+            'segment_workers': self.segment_workers,
+            'preflight': self.preflight_enabled,
+            'thread_cores': self.thread_cores,
+            'concurrent_jobs': self.concurrent_jobs,
+            'job_order': self.job_order,
+            'memory_admission': self.memory_admission,
+            'render_backend': self.render_backend,
+            'render_cache': self.render_cache_enabled,
+            'render_cache_max_gb': self.render_cache_max_gb,
+            'recent_files': []  # Recent files functionality removed
+        }
+    
     def add_to_recent_files(self, file_path):
         try:
             with open('looper_settings.json', 'r') as f:
@@ -2616,7 +5487,11 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
             return []
     
     def remove_file_by_index(self, index):
-        """Remove file by index"""
+        """Remove file by index (cancels its job instead while a batch is running)"""
+        if self.is_processing:
+            # Rows and jobs must stay index-aligned while the batch runs
+            self.cancel_job(index)
+            return
         if 0 <= index < len(self.video_infos):
             # Remove from both lists
             del self.video_infos[index]
@@ -2666,42 +5541,32 @@ Size: {self.video_info['file_size_mb']:.1f} MB"""
             if not self.video_infos:
                 self.process_button.config(state=tk.DISABLED)
     
-    def load_recent_file(self, event):
-        selection = self.recent_listbox.curselection()
-        if selection:
-            try:
-                with open('looper_settings.json', 'r') as f:
-                    settings = json.load(f)
-                    recent_files = settings.get('recent_files', [])
-                    if selection[0] < len(recent_files):
-                        file_path = recent_files[selection[0]]
-                        if os.path.exists(file_path):
-                            self.video_paths = [file_path]
-                            self.analyze_all_videos()
-                            self.update_file_display()
-                            self.process_button.config(state=tk.NORMAL)
-            except:
-                pass
-    
     def update_status(self, message, progress):
         """Update status with thread-safe GUI updates"""
-        def update():
-            self.status_label.config(text=message)
-            self.progress_var.set(progress)
-            
-            # Update custom progress bar
-            if hasattr(self, 'progress_bar_fill') and hasattr(self, 'progress_label'):
-                # Calculate width based on progress percentage
-                total_width = self.progress_bar_frame.winfo_width()
-                if total_width > 0:
-                    fill_width = int((progress / 100.0) * total_width)
-                    self.progress_bar_fill.config(width=fill_width)
-                
-                # Update percentage label
-                self.progress_label.config(text=f"{progress:.1f}%")
+        row = getattr(self.job_context, 'row', None)
+        if row is not None:
+            # Concurrent jobs report on their own queue row; the main bar shows the batch
+            self.set_job_status(row, f"{progress:3.0f}% {message[:40]}")
+            return
+        self.root.after(0, lambda: self.render_status(message, progress))
+    
+    def render_status(self, message, progress):
+        """Draw status text and progress bar immediately (main thread only)"""
+        self.status_label.config(text=message)
+        self.progress_var.set(progress)
+        
+        # Update custom progress bar
+        if hasattr(self, 'progress_bar_fill') and hasattr(self, 'progress_label'):
+            # Calculate width based on progress percentage
+            total_width = self.progress_bar_frame.winfo_width()
+            if total_width > 0:
+                fill_width = int((progress / 100.0) * total_width)
+                self.progress_bar_fill.config(width=fill_width)
             
-            self.root.update_idletasks()
-        self.root.after(0, update)
+            # Update percentage label
+            self.progress_label.config(text=f"{progress:.1f}%")
+        
+        self.root.update_idletasks()
 
 def main():
     # Try to use tkinterdnd2 for better drag and drop support
@@ -0,0 +1,70 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+
+@pytest.fixture
+def looper():
+    """The looper module; its GUI/imaging imports are real runtime requirements."""
+    pytest.importorskip('numpy')
+    pytest.importorskip('PIL')
+    pytest.importorskip('cv2')
+    import looper
+    return looper
+
+
+@pytest.fixture
+def app(looper, tmp_path, monkeypatch):
+    """A LooperApp on a hidden Tk root, with settings and caches kept in tmp_path."""
+    import tkinter as tk
+    monkeypatch.chdir(tmp_path)
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display available for Tk")
+    root.withdraw()
+    try:
+        yield looper.LooperApp(root)
+    finally:
+        root.destroy()
+
+
+@pytest.fixture
+def ffmpeg():
+    if not shutil.which('ffmpeg') or not shutil.which('ffprobe'):
+        pytest.skip("ffmpeg/ffprobe not on PATH")
+    return shutil.which('ffmpeg')
+
+
+@pytest.fixture
+def make_clip(ffmpeg, tmp_path):
+    """Encode a synthetic test clip and return its path."""
+    def make(name='clip.mp4', seconds=4, fps=30, gop=15, size='320x240', x264_params=None):
+        path = str(tmp_path / name)
+        subprocess.run([
+            ffmpeg, '-v', 'error', '-y', '-f', 'lavfi', '-i', f"testsrc2=size={size}:rate={fps}",
+            '-t', str(seconds), '-c:v', 'libx264', '-g', str(gop), '-pix_fmt', 'yuv420p',
+            *(['-x264-params', x264_params] if x264_params else []), path
+        ], check=True)
+        return path
+    return make
+
+
+def decode_gray_frames(ffmpeg, path):
+    """All frames of path as a list of grayscale byte strings, plus (width, height)."""
+    probe = subprocess.run([
+        'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height', '-of', 'csv=p=0', path
+    ], capture_output=True, text=True, check=True)
+    width, height = (int(v) for v in probe.stdout.strip().split(',')[:2])
+    raw = subprocess.run([
+        ffmpeg, '-v', 'error', '-i', path, '-map', '0:v:0',
+        '-fps_mode', 'passthrough', '-f', 'rawvideo', '-pix_fmt', 'gray', '-'
+    ], capture_output=True, check=True).stdout
+    frame_size = width * height
+    return [raw[i:i + frame_size] for i in range(0, len(raw), frame_size)], (width, height)
@@ -0,0 +1,75 @@
+GRAPH_FAILURE_AFTER_TIMESTAMP_WARNINGS = """\
+Input #0, matroska,webm, from 'clip.mkv':
+  Duration: 00:00:40.00, start: 0.000000, bitrate: 4012 kb/s
+  Stream #0:0: Video: h264 (High), yuv420p(progressive), 1920x1080, 30 fps, 30 tbr, 1k tbn
+[matroska,webm @ 0x5581d6a3c940] Invalid timestamps stream=0, pts=NOPTS, dts=33, size=5120
+[matroska,webm @ 0x5581d6a3c940] Invalid timestamps stream=0, pts=NOPTS, dts=66, size=4980
+[AVFilterGraph @ 0x5581d6b01c80] No option name near 'fade=t=in:st=0:d=1:alpha=1:x'
+[AVFilterGraph @ 0x5581d6b01c80] Error parsing a filter description around: [tail]
+[fc#0 @ 0x5581d6a41a00] Error initializing complex filters: Invalid argument
+Error initializing complex filters.
+"""
+
+MISSING_CONCAT_PART = """\
+[concat @ 0x5622f8c2a400] Impossible to open '/tmp/looper_segments_k2j4/segment_0002.ts'
+[in#0 @ 0x5622f8c2a200] Error opening input: No such file or directory
+Error opening input file /tmp/looper_segments_k2j4/concat.txt.
+Error opening input files: No such file or directory
+"""
+
+TRUNCATED_SOURCE = """\
+[mov,mp4,m4a,3gp,3g2,mj2 @ 0x55e0a1d3e9c0] moov atom not found
+[in#0 @ 0x55e0a1d3e7c0] Error opening input: Invalid data found when processing input
+Error opening input file broken.mp4.
+Error opening input files: Invalid data found when processing input
+"""
+
+DISK_FULL_AFTER_DECODE_ERRORS = """\
+[h264 @ 0x55b2e41c8d00] error while decoding MB 42 17, bytestream -7
+[vist#0:0/h264 @ 0x55b2e41c7a00] Error while decoding stream #0:0: Invalid data found when processing input
+frame=  540 fps=120 q=23.0 size=   10240KiB time=00:00:18.00 bitrate=4660.1kbits/s speed=4.00x
+[out#0/mp4 @ 0x55b2e41c5f40] Error writing trailer: No space left on device
+[out#0/mp4 @ 0x55b2e41c5f40] Error closing file: No space left on device
+Conversion failed!
+"""
+
+NON_MONOTONIC_DTS = """\
+[mpegts @ 0x5594c3a2b100] Invalid timestamp in stream 0
+[mp4 @ 0x5594c3a2d8c0] Application provided invalid, non monotonically increasing dts to muxer in stream 0: 1024 >= 1024
+[vost#0:0/copy @ 0x5594c3a2e040] Error submitting a packet to the muxer: Invalid argument
+Conversion failed!
+"""
+
+
+def classify(looper, stderr):
+    # run_ffmpeg collects stderr as a list of newline-terminated lines
+    return looper.classify_ffmpeg_failure(stderr.splitlines(keepends=True))
+
+
+def test_graph_error_wins_over_earlier_timestamp_warnings(looper):
+    assert classify(looper, GRAPH_FAILURE_AFTER_TIMESTAMP_WARNINGS) == 'filter_graph'
+
+
+def test_missing_intermediate_is_not_fatal(looper):
+    failure = classify(looper, MISSING_CONCAT_PART)
+    assert failure == 'missing_file'
+    assert failure not in looper.FATAL_FAILURES
+    assert not looper.FAILURE_SKIPS[failure] & {'complex', 'pipe', 'simple'}
+
+
+def test_unreadable_source_is_fatal(looper):
+    failure = classify(looper, TRUNCATED_SOURCE)
+    assert failure == 'corrupt_input'
+    assert failure in looper.FATAL_FAILURES
+
+
+def test_disk_full_wins_over_earlier_decode_errors(looper):
+    assert classify(looper, DISK_FULL_AFTER_DECODE_ERRORS) == 'disk_full'
+
+
+def test_muxer_timestamp_failure(looper):
+    assert classify(looper, NON_MONOTONIC_DTS) == 'bad_timestamps'
+
+
+def test_unrecognised_failure(looper):
+    assert classify(looper, "Conversion failed!\n") == 'unknown'
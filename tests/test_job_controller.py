@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+
+def sleeper():
+    return subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(5)'])
+
+
+def test_cancel_all_does_not_outlive_the_batch(looper):
+    controller = looper.JobController()
+    running = sleeper()
+    controller.register(0, running)
+    controller.cancel()
+    assert running.wait(timeout=5) != 0
+    assert controller.is_cancelled(1)
+
+    controller.reset()  # what process_videos_thread does when the batch ends
+    assert not controller.is_cancelled(1)
+    later = sleeper()
+    try:
+        controller.register(1, later)
+        assert later.poll() is None
+    finally:
+        later.kill()
+        later.wait()
+
+
+def test_cancelling_one_job_leaves_the_others(looper):
+    controller = looper.JobController()
+    first, second = sleeper(), sleeper()
+    try:
+        controller.register(0, first)
+        controller.register(1, second)
+        controller.cancel(0)
+        assert first.wait(timeout=5) != 0
+        assert second.poll() is None
+        assert controller.is_cancelled(0) and not controller.is_cancelled(1)
+    finally:
+        second.kill()
+        second.wait()
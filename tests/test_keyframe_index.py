@@ -0,0 +1,13 @@
+def test_closed_gop_keyframes_are_all_entry_points(app, make_clip):
+    clip = make_clip(seconds=4, fps=30, gop=15, x264_params='scenecut=0')
+    keyframes = app.extract_keyframe_index(clip)
+    assert keyframes == [i * 0.5 for i in range(8)]
+
+
+def test_open_gop_keyframes_are_not_entry_points(app, make_clip):
+    closed = make_clip('closed.mp4', seconds=4, fps=30, gop=15, x264_params='scenecut=0:bframes=3')
+    opened = make_clip('open.mp4', seconds=4, fps=30, gop=15, x264_params='scenecut=0:bframes=3:open-gop=1')
+    open_keyframes = app.extract_keyframe_index(opened)
+    # The first keyframe is an IDR; the recovery-point I-frames after it have leading B-frames
+    assert open_keyframes[0] == 0.0
+    assert len(open_keyframes) < len(app.extract_keyframe_index(closed))
@@ -0,0 +1,27 @@
+import numpy as np
+
+from conftest import decode_gray_frames
+
+
+def test_pipe_render_matches_filter_graph(app, make_clip, ffmpeg, tmp_path):
+    """The numpy pipe backend must produce the same loop as the filter graph, frame for frame."""
+    clip = make_clip(fps=30, seconds=4, gop=15)
+    info = app.probe_video_file(clip)
+    assert info is not None
+
+    graph_out = str(tmp_path / 'graph.mp4')
+    pipe_out = str(tmp_path / 'pipe.mp4')
+    assert app.try_complex_filter_for_file(clip, graph_out, 30, info, "MP4")
+    assert app.try_pipe_render_for_file(clip, pipe_out, 30, info, "MP4")
+
+    graph_frames, graph_size = decode_gray_frames(ffmpeg, graph_out)
+    pipe_frames, pipe_size = decode_gray_frames(ffmpeg, pipe_out)
+    assert graph_size == pipe_size
+    _, _, _, output_duration, _ = app.loop_timing(30, info.frame_count, info.fps)
+    assert len(pipe_frames) == len(graph_frames) == int(round(output_duration * info.fps))
+
+    for index, (graph_frame, pipe_frame) in enumerate(zip(graph_frames, pipe_frames)):
+        diff = np.abs(np.frombuffer(graph_frame, np.uint8).astype(np.int16)
+                      - np.frombuffer(pipe_frame, np.uint8).astype(np.int16))
+        # Both outputs are lossy encodes of the same frames: allow codec noise, not a wrong frame
+        assert diff.mean() < 3, f"frame {index} differs (mean {diff.mean():.1f}, max {diff.max()})"
@@ -0,0 +1,28 @@
+import json
+
+
+def test_profile_and_level_round_trip(looper, tmp_path):
+    clip = tmp_path / 'clip.mp4'
+    clip.write_bytes(b'\0' * 1024)
+    cache = looper.ProbeCache(str(tmp_path / 'cache.db'))
+    info = looper.VideoInfo(str(clip), 30.0, 300, 1920, 1080, 10.0, 0.001, probe_engine='fast',
+                            codec_name='h264', pix_fmt='yuv420p', profile='High', level=40)
+    cache.put(str(clip), info)
+
+    cached = cache.get(str(clip))
+    assert (cached.profile, cached.level) == ('High', 40)
+
+
+def test_entry_missing_a_field_is_reprobed(looper, tmp_path):
+    clip = tmp_path / 'clip.mp4'
+    clip.write_bytes(b'\0' * 1024)
+    cache = looper.ProbeCache(str(tmp_path / 'cache.db'))
+    info = looper.VideoInfo(str(clip), 30.0, 300, 1920, 1080, 10.0, 0.001, probe_engine='fast')
+    cache.put(str(clip), info)
+
+    # Rewrite the row as an older release stored it, before profile/level were probed
+    data = info.to_dict()
+    del data['profile'], data['level']
+    cache.conn.execute("UPDATE probe_cache SET info = ?", (json.dumps(data),))
+    cache.conn.commit()
+    assert cache.get(str(clip)) is None
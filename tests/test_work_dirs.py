@@ -0,0 +1,19 @@
+import os
+import time
+
+
+def test_only_stale_work_dirs_are_removed(looper, tmp_path, monkeypatch):
+    monkeypatch.setattr(looper.tempfile, 'gettempdir', lambda: str(tmp_path))
+    stale = tmp_path / 'looper_smart_old'
+    fresh = tmp_path / 'looper_smart_new'
+    other = tmp_path / 'unrelated_old'
+    for path in (stale, fresh, other):
+        path.mkdir()
+        (path / 'head.ts').write_bytes(b'\0')
+    old = time.time() - looper.STALE_WORK_DIR_SECONDS - 60
+    os.utime(stale, (old, old))
+    os.utime(other, (old, old))
+
+    looper.remove_stale_work_dirs()
+    assert not stale.exists()
+    assert fresh.exists() and other.exists()